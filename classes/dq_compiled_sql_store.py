@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import sqlite3
+
+from sqlite_utils import Database
+from sqlite_utils.db import NotFoundError
+from logger import getlogger
+
+logger = getlogger()
+
+COMPILED_SQL_TABLE = "compiled_sql"
+
+
+@dataclass
+class DqCompiledSqlStore:
+    """Rendered rule binding SQL persisted across runs.
+
+    One row per rule binding, holding the SQL rendered for the last
+    compiled_sql_key seen. The SQL still contains the run-time placeholders
+    (high watermark, current timestamp, snapshot date) that are bound after
+    it is fetched.
+    """
+
+    _store_db: Database
+    hits: int
+    misses: int
+
+    def __init__(self, sqlite3_db_name: str | None = None, recreate: bool = False):
+        if sqlite3_db_name:
+            store_db = Database(sqlite3.connect(sqlite3_db_name))
+        else:
+            store_db = Database("dq_compiled_sql.db", recreate=recreate)
+        self._store_db = store_db
+        self.hits = 0
+        self.misses = 0
+
+    def get_compiled_sql(
+        self, rule_binding_id: str, compiled_sql_key: str
+    ) -> dict | None:
+        try:
+            record = self._store_db[COMPILED_SQL_TABLE].get(rule_binding_id)
+        except NotFoundError:
+            record = None
+        if not record or record["compiled_sql_key"] != compiled_sql_key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.debug(f"Reusing compiled SQL for rule binding {rule_binding_id}")
+        return {
+            key: value
+            for key, value in record.items()
+            if key not in ("rule_binding_id", "compiled_sql_key") and value is not None
+        }
+
+    def put_compiled_sql(
+        self,
+        rule_binding_id: str,
+        compiled_sql_key: str,
+        generated_sql_string: str,
+        failed_records_sql_string: str,
+        validation_results_sql_string: str | None = None,
+    ) -> None:
+        self._store_db[COMPILED_SQL_TABLE].upsert(
+            {
+                "rule_binding_id": rule_binding_id,
+                "compiled_sql_key": compiled_sql_key,
+                "generated_sql_string": generated_sql_string,
+                "failed_records_sql_string": failed_records_sql_string,
+                "validation_results_sql_string": validation_results_sql_string,
+            },
+            pk="rule_binding_id",
+            alter=True,
+        )
+
+    def get_stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from pprint import pformat
 
+import copy
+import json
 import re
 import sqlite3
+import threading
+import typing
 
 from sqlite_utils import Database
 from sqlite_utils.db import NotFoundError
@@ -23,37 +28,281 @@ logger = getlogger()
 
 RE_NON_ALPHANUMERIC = re.compile(r"[^0-9a-zA-Z_]+")
 NUM_RULES_PER_TABLE = 50
+# Bump whenever the layout of the cached rows changes so that
+# persisted caches written by an older version are rebuilt.
+CONFIGS_CACHE_VERSION = 2
+CONFIG_FILES_TABLE = "config_files"
+CONFIG_SOURCES_TABLE = "config_sources"
+CONFIG_TABLES = (
+    "entities",
+    "row_filters",
+    "reference_columns",
+    "rule_dimensions",
+    "rules",
+    "rule_bindings",
+)
+# Link tables from a rule binding to the configs it references, holding the
+# canonical upper-cased IDs. Each maps the link table name to the referenced
+# ID column and the primary key of the link rows.
+RULE_BINDING_LINK_TABLES = {
+    "rule_binding_entities": ("entity_id", ("rule_binding_id",)),
+    "rule_binding_row_filters": ("row_filter_id", ("rule_binding_id",)),
+    "rule_binding_rules": ("rule_id", ("rule_binding_id", "position")),
+}
+SQLITE_MAX_VARIABLES = 500
+RESOLVED_CONFIGS_CACHE_SIZE = 1024
 GET_ENTITY_SUMMARY_QUERY = """
 select
     e.schema_name,
     e.table_name,
-    group_concat(rb.id, ',') as rule_binding_ids_list,
-    group_concat(json_array_length(rb.rule_ids), ',') as rules_per_rule_binding
+    group_concat(rbe.rule_binding_id, ',') as rule_binding_ids_list,
+    group_concat(
+        (
+            select count(*)
+            from rule_binding_rules rbr
+            where rbr.rule_binding_id = rbe.rule_binding_id
+        ),
+        ','
+    ) as rules_per_rule_binding
 from
-    entities e
+    rule_binding_entities rbe
 inner join
-    rule_bindings rb
-    on UPPER(e.id) = UPPER(rb.entity_id)
+    entities e
+    on e.id = rbe.entity_id
 where
-    rb.id in ({target_rule_binding_ids_list})
+    rbe.rule_binding_id in ({target_rule_binding_ids_list})
 group by
     e.schema_name,
     e.table_name
 """
 
+
+def validate_config(table_name: str, config_id: str, config: dict) -> typing.Any:
+    if table_name == "entities":
+        return dq_entity.DqEntity.from_dict(config_id, config)
+    elif table_name == "row_filters":
+        return dq_row_filter.DqRowFilter.from_dict(
+            row_filter_id=config_id, kwargs=config
+        )
+    elif table_name == "reference_columns":
+        return dq_reference_columns.DqReferenceColumns.from_dict(
+            reference_columns_id=config_id, kwargs=config
+        )
+    elif table_name == "rules":
+        return dq_rule.DqRule.from_dict(rule_id=config_id, kwargs=config)
+    elif table_name == "rule_bindings":
+        return dq_rule_binding.DqRuleBinding.from_dict(
+            rule_binding_id=config_id, kwargs=config, validate_uri=False
+        )
+    else:
+        raise ValueError(f"Unsupported config type '{table_name}'.")
+
+
+def validate_configs(table_name: str, collection: dict) -> dict:
+    """Validate every config in collection, keeping errors as values.
+
+    Used by the parallel loader: errors are re-raised by the
+    load_all_*_collection methods in the same order as the serial path.
+    """
+    validated_configs = {}
+    for config_id, config in collection.items():
+        try:
+            validated_configs[config_id] = validate_config(table_name, config_id, config)
+        except Exception as error:
+            validated_configs[config_id] = error
+    return validated_configs
+
+
+def entity_from_record(entity_id: str, entity_record: dict) -> dq_entity.DqEntity:
+    convert_json_value_to_dict(entity_record, "environment_override")
+    convert_json_value_to_dict(entity_record, "columns")
+    if type(entity_record.get("partition_fields")) == str:
+        entity_record["partition_fields"] = json.loads(entity_record["partition_fields"])
+    logger.info(f"entity_record_2:{entity_record}")
+    entity = dq_entity.DqEntity.from_dict(entity_id, entity_record)
+    #partition_fields = entity.get_partition_fields()
+    #entity.partition_fields = partition_fields
+    return entity
+
+
+def rule_from_record(rule_id: str, rule_record: dict) -> dq_rule.DqRule:
+    convert_json_value_to_dict(rule_record, "params")
+    return dq_rule.DqRule.from_dict(rule_id, rule_record)
+
+
+def row_filter_from_record(
+    row_filter_id: str, row_filter_record: dict
+) -> dq_row_filter.DqRowFilter:
+    return dq_row_filter.DqRowFilter.from_dict(row_filter_id, row_filter_record)
+
+
+def reference_columns_from_record(
+    reference_columns_id: str, reference_columns_record: dict
+) -> dq_reference_columns.DqReferenceColumns:
+    return dq_reference_columns.DqReferenceColumns.from_dict(
+        reference_columns_id,
+        transform_dq_reference_columns_to_dict(reference_columns_record),
+    )
+
+
+def rule_binding_from_record(
+    rule_binding_id: str, rule_binding_record: dict
+) -> dq_rule_binding.DqRuleBinding:
+    convert_json_value_to_dict(rule_binding_record, "rule_ids")
+    convert_json_value_to_dict(rule_binding_record, "metadata")
+    convert_json_value_to_dict(rule_binding_record, "sampling")
+    return dq_rule_binding.DqRuleBinding.from_dict(
+        rule_binding_id, rule_binding_record
+    )
+
+
+CONFIG_RECORD_BUILDERS = {
+    "entities": entity_from_record,
+    "rules": rule_from_record,
+    "row_filters": row_filter_from_record,
+    "reference_columns": reference_columns_from_record,
+}
+
+
+class DqConfigsAccumulator:
+    """Merges the configs of one config type file by file, in place.
+
+    Remembers which file every config ID came from, so that merging stays
+    linear in the number of config IDs and conflicting duplicates can be
+    reported together with both source files.
+    """
+
+    def __init__(self, configs_type: str):
+        # accepts DqConfigType members as well as their plain string values
+        self.configs_type = getattr(configs_type, "value", configs_type)
+        self.configs: list | dict = [] if configs_type == "rule_dimensions" else {}
+        self.config_sources: dict[str, str] = {}
+
+    def add(self, config: list | dict, source: typing.Any) -> None:
+        if not config:
+            return
+        if self.configs_type == "rule_dimensions":
+            self.add_list(config, str(source))
+        else:
+            self.add_dict(config, str(source))
+
+    def add_dict(self, config: dict, source: str) -> None:
+        conflicts = [
+            config_id
+            for config_id, config_value in config.items()
+            if config_id in self.configs and self.configs[config_id] != config_value
+        ]
+        if conflicts:
+            raise ValueError(
+                f"Detected Duplicated Config ID(s): {set(conflicts)}. "
+                f"If a config ID is repeated, it must be for an identical "
+                f"configuration.\n"
+                + "".join(
+                    f"Config ID '{config_id}' is defined in both "
+                    f"'{self.config_sources[config_id]}' and '{source}':\n"
+                    f"{pformat(self.configs[config_id])}\n"
+                    f"{pformat(config[config_id])}\n"
+                    for config_id in conflicts
+                )
+            )
+        for config_id, config_value in config.items():
+            if config_id not in self.configs:
+                self.configs[config_id] = config_value
+                self.config_sources[config_id] = source
+
+    def add_list(self, config: list, source: str) -> None:
+        if not self.configs:
+            self.configs.extend(config)
+            self.config_sources[self.configs_type] = source
+        elif not sorted(self.configs) == sorted(config):
+            raise ValueError(
+                f"Detected Duplicated Config: {config}."
+                f"If a config is repeated, it must be identical.\n"
+                f"'{self.configs_type}' is defined in both "
+                f"'{self.config_sources[self.configs_type]}' and '{source}'."
+            )
+
+
 @dataclass
 class DqConfigsCache:
     _cache_db: Database
+    _resolved_configs: OrderedDict
+    _resolved_configs_maxsize: int
+    resolved_configs_hits: int
+    resolved_configs_misses: int
 
-    def __init__(self, sqlite3_db_name: str | None = None):
+    def __init__(
+        self,
+        sqlite3_db_name: str | None = None,
+        recreate: bool = False,
+        resolved_configs_maxsize: int = RESOLVED_CONFIGS_CACHE_SIZE,
+    ):
         if sqlite3_db_name:
             cache_db = Database(sqlite3.connect(sqlite3_db_name))
         else:
-            cache_db = Database("dq_configs.db", recreate=True)
+            cache_db = Database("dq_configs.db", recreate=recreate)
         self._cache_db = cache_db
+        # LRU of resolved config objects keyed by (table_name, config_id).
+        # Callers mutate the objects they get back (e.g. rule params), so
+        # the memoized instances are never handed out, only copies of them.
+        self._resolved_configs = OrderedDict()
+        self._resolved_configs_maxsize = resolved_configs_maxsize
+        self._resolved_configs_lock = threading.Lock()
+        # Configs prefetched by a resolve_rule_bindings call on this thread,
+        # kept for the whole call however many there are.
+        self._prefetched_configs = threading.local()
+        self.resolved_configs_hits = 0
+        self.resolved_configs_misses = 0
+        self.create_rule_binding_link_tables()
+
+    def _get_resolved_config(self, table_name: str, config_id: str) -> typing.Any:
+        prefetched_configs = getattr(self._prefetched_configs, "configs", None)
+        if prefetched_configs and (table_name, config_id) in prefetched_configs:
+            with self._resolved_configs_lock:
+                self.resolved_configs_hits += 1
+            return copy.deepcopy(prefetched_configs[(table_name, config_id)])
+        with self._resolved_configs_lock:
+            resolved_config = self._resolved_configs.get((table_name, config_id))
+            if resolved_config is None:
+                self.resolved_configs_misses += 1
+                return None
+            self._resolved_configs.move_to_end((table_name, config_id))
+            self.resolved_configs_hits += 1
+        return copy.deepcopy(resolved_config)
+
+    def _store_resolved_config(
+        self, table_name: str, config_id: str, resolved_config: typing.Any
+    ) -> None:
+        with self._resolved_configs_lock:
+            self._resolved_configs[(table_name, config_id)] = resolved_config
+            self._resolved_configs.move_to_end((table_name, config_id))
+            while len(self._resolved_configs) > self._resolved_configs_maxsize:
+                self._resolved_configs.popitem(last=False)
+
+    def _put_resolved_config(
+        self, table_name: str, config_id: str, resolved_config: typing.Any
+    ) -> typing.Any:
+        self._store_resolved_config(table_name, config_id, resolved_config)
+        return copy.deepcopy(resolved_config)
+
+    def invalidate_resolved_configs(self, table_name: str) -> None:
+        with self._resolved_configs_lock:
+            for key in [key for key in self._resolved_configs if key[0] == table_name]:
+                del self._resolved_configs[key]
+
+    def get_resolved_configs_stats(self) -> dict:
+        return {
+            "hits": self.resolved_configs_hits,
+            "misses": self.resolved_configs_misses,
+            "size": len(self._resolved_configs),
+            "maxsize": self._resolved_configs_maxsize,
+        }
 
     def get_table_entity_id(self, entity_id: str) -> dq_entity.DqEntity:
         entity_id = entity_id.upper()
+        entity = self._get_resolved_config("entities", entity_id)
+        if entity:
+            return entity
         try:
             logger.debug(
                 f"Attempting to get from configs cache table entity_id: {entity_id}"
@@ -67,16 +316,14 @@ class DqConfigsCache:
                 f"{pformat(list(self._cache_db.query('select id from entities')))}"
             )
             raise NotFoundError(error_message)
-        convert_json_value_to_dict(entity_record, "environment_override")
-        convert_json_value_to_dict(entity_record, "columns")
-        logger.info(f"entity_record_2:{entity_record}")
-        entity = dq_entity.DqEntity.from_dict(entity_id, entity_record)
-        #partition_fields = entity.get_partition_fields()
-        #entity.partition_fields = partition_fields
-        return entity
+        entity = entity_from_record(entity_id, entity_record)
+        return self._put_resolved_config("entities", entity_id, entity)
 
     def get_rule_id(self, rule_id: str) -> dq_rule.DqRule:
         rule_id = rule_id.upper()
+        rule = self._get_resolved_config("rules", rule_id)
+        if rule:
+            return rule
         try:
             rule_record = self._cache_db["rules"].get(rule_id)
         except NotFoundError:
@@ -86,9 +333,8 @@ class DqConfigsCache:
             )
             logger.error(error_message, exc_info=True)
             raise NotFoundError(error_message)
-        convert_json_value_to_dict(rule_record, "params")
-        rule = dq_rule.DqRule.from_dict(rule_id, rule_record)
-        return rule
+        rule = rule_from_record(rule_id, rule_record)
+        return self._put_resolved_config("rules", rule_id, rule)
 
     def get_rule_dimensions(self) -> dq_rule.DqRuleDimensions:
         try:
@@ -104,6 +350,9 @@ class DqConfigsCache:
 
     def get_row_filter_id(self, row_filter_id: str) -> dq_row_filter.DqRowFilter:
         row_filter_id = row_filter_id.upper()
+        row_filter = self._get_resolved_config("row_filters", row_filter_id)
+        if row_filter:
+            return row_filter
         try:
             row_filter_record = self._cache_db["row_filters"].get(row_filter_id)
         except NotFoundError:
@@ -112,22 +361,22 @@ class DqConfigsCache:
                 f"{pformat(list(self._cache_db.query('select id from row_filters')))}"
             )
             raise NotFoundError(error_message)
-        row_filter = dq_row_filter.DqRowFilter.from_dict(
-            row_filter_id, row_filter_record
-        )
-        return row_filter
+        row_filter = row_filter_from_record(row_filter_id, row_filter_record)
+        return self._put_resolved_config("row_filters", row_filter_id, row_filter)
 
     def get_reference_columns_id(
         self, reference_columns_id: str
     ) -> dq_reference_columns.DqReferenceColumns:
         reference_columns_id = reference_columns_id.upper()
+        reference_columns = self._get_resolved_config(
+            "reference_columns", reference_columns_id
+        )
+        if reference_columns:
+            return reference_columns
         try:
             reference_columns_record = self._cache_db["reference_columns"].get(
                 reference_columns_id
             )
-            reference_columns_record_obj = transform_dq_reference_columns_to_dict(
-                reference_columns_record
-            )
         except NotFoundError:
             error_message = (
                 f"Reference Column ID: {reference_columns_id} not found in 'reference_columns' config cache:\n"
@@ -135,10 +384,12 @@ class DqConfigsCache:
                 f"{pformat(list(self._cache_db.query('select id from reference_columns')))}"
             )
             raise NotFoundError(error_message)
-        reference_columns = dq_reference_columns.DqReferenceColumns.from_dict(
-            reference_columns_id, reference_columns_record_obj
+        reference_columns = reference_columns_from_record(
+            reference_columns_id, reference_columns_record
+        )
+        return self._put_resolved_config(
+            "reference_columns", reference_columns_id, reference_columns
         )
-        return reference_columns
 
     def get_rule_binding_id(
         self, rule_binding_id: str
@@ -152,65 +403,247 @@ class DqConfigsCache:
                 f"{pformat(list(self._cache_db.query('select id from rule_bindings')))}"
             )
             raise NotFoundError(error_message)
-        convert_json_value_to_dict(rule_binding_record, "rule_ids")
-        convert_json_value_to_dict(rule_binding_record, "metadata")
-        rule_binding = dq_rule_binding.DqRuleBinding.from_dict(
-            rule_binding_id, rule_binding_record
+        return rule_binding_from_record(rule_binding_id, rule_binding_record)
+
+    def get_rule_binding_ids_using_entity(self, entity_id: str) -> list[str]:
+        return self._get_linked_rule_binding_ids("rule_binding_entities", entity_id)
+
+    def get_rule_binding_ids_using_row_filter(self, row_filter_id: str) -> list[str]:
+        return self._get_linked_rule_binding_ids(
+            "rule_binding_row_filters", row_filter_id
         )
-        return rule_binding
 
-    def load_all_rule_bindings_collection(self, rule_binding_collection: dict) -> None:
+    def get_rule_binding_ids_using_rule(self, rule_id: str) -> list[str]:
+        return self._get_linked_rule_binding_ids("rule_binding_rules", rule_id)
+
+    def _get_linked_rule_binding_ids(
+        self, link_table_name: str, config_id: str
+    ) -> list[str]:
+        config_id_column, _ = RULE_BINDING_LINK_TABLES[link_table_name]
+        return [
+            row[0]
+            for row in self._cache_db.execute(
+                f"select distinct rule_binding_id from [{link_table_name}] "
+                f"where [{config_id_column}] = ? order by rule_binding_id",
+                [config_id.upper()],
+            )
+        ]
+
+    def get_records(self, table_name: str, config_ids: typing.Iterable[str]) -> list[dict]:
+        config_ids = list(config_ids)
+        records: list[dict] = []
+        if not config_ids or table_name not in self._cache_db.table_names():
+            return records
+        for index in range(0, len(config_ids), SQLITE_MAX_VARIABLES):
+            chunk = config_ids[index:index + SQLITE_MAX_VARIABLES]
+            records.extend(
+                self._cache_db.query(
+                    f"select * from [{table_name}] "
+                    f"where id in ({','.join('?' for _ in chunk)})",
+                    chunk,
+                )
+            )
+        return records
+
+    def prefetch_configs(
+        self, table_name: str, config_ids: typing.Iterable[str]
+    ) -> dict[str, typing.Any]:
+        """Resolved configs of the given IDs, loading the ones not in the LRU.
+
+        The missing IDs are loaded with one IN (...) query and also stored in
+        the resolved configs LRU for later calls. IDs missing from the cache
+        are skipped here; the regular get_* lookup raises the usual
+        NotFoundError for them.
+        """
+        builder = CONFIG_RECORD_BUILDERS[table_name]
+        prefetched_configs = {}
+        missing_config_ids = set()
+        with self._resolved_configs_lock:
+            for config_id in {config_id.upper() for config_id in config_ids}:
+                resolved_config = self._resolved_configs.get((table_name, config_id))
+                if resolved_config is None:
+                    missing_config_ids.add(config_id)
+                else:
+                    prefetched_configs[config_id] = resolved_config
+        for record in self.get_records(table_name, sorted(missing_config_ids)):
+            resolved_config = builder(record["id"], record)
+            self._store_resolved_config(table_name, record["id"], resolved_config)
+            prefetched_configs[record["id"]] = resolved_config
+        return prefetched_configs
+
+    def resolve_rule_bindings(self, rule_binding_ids: list[str]) -> dict[str, dict]:
+        """Resolve all configs needed by rule_binding_ids in bulk.
+
+        Rule bindings and every entity, rule, row filter and reference
+        columns config they reference are fetched with one IN (...) query per
+        config type, so resolution does not issue one query per lookup. The
+        fetched configs are looked up from a dict for the whole call, since
+        the LRU may be too small to hold all of them. Returns the output of
+        DqRuleBinding.resolve_all_configs_to_dict keyed by rule binding ID.
+        """
+        rule_binding_ids = [rule_binding_id.upper() for rule_binding_id in rule_binding_ids]
+        rule_bindings = {
+            record["id"]: rule_binding_from_record(record["id"], record)
+            for record in self.get_records("rule_bindings", rule_binding_ids)
+        }
+        for rule_binding_id in rule_binding_ids:
+            if rule_binding_id not in rule_bindings:
+                rule_bindings[rule_binding_id] = self.get_rule_binding_id(rule_binding_id)
+        referenced_config_ids = {
+            "entities": [rb.entity_id for rb in rule_bindings.values() if rb.entity_id],
+            "rules": [
+                rule_id for rb in rule_bindings.values() for rule_id in rb.get_rule_ids()
+            ],
+            "row_filters": [
+                rb.row_filter_id for rb in rule_bindings.values() if rb.row_filter_id
+            ],
+            "reference_columns": [
+                rb.reference_columns_id
+                for rb in rule_bindings.values()
+                if rb.reference_columns_id
+            ],
+        }
+        prefetched_configs = {}
+        for table_name, config_ids in referenced_config_ids.items():
+            for config_id, resolved_config in self.prefetch_configs(
+                table_name, config_ids
+            ).items():
+                prefetched_configs[(table_name, config_id)] = resolved_config
+        self._prefetched_configs.configs = prefetched_configs
+        try:
+            return {
+                rule_binding_id: rule_bindings[
+                    rule_binding_id
+                ].resolve_all_configs_to_dict(configs_cache=self)
+                for rule_binding_id in rule_binding_ids
+            }
+        finally:
+            self._prefetched_configs.configs = None
+
+    @staticmethod
+    def get_validated_config(
+        table_name: str,
+        config_id: str,
+        config: dict,
+        validated_configs: dict | None = None,
+    ) -> typing.Any:
+        if validated_configs and config_id in validated_configs:
+            validated_config = validated_configs[config_id]
+            if isinstance(validated_config, Exception):
+                raise validated_config
+            return validated_config
+        return validate_config(table_name, config_id, config)
+
+    def load_all_rule_bindings_collection(
+        self, rule_binding_collection: dict, validated_configs: dict | None = None
+    ) -> None:
         logger.debug(
             f"Loading 'rule_bindings' configs into cache:\n{pformat(rule_binding_collection.keys())}"
         )
         rule_bindings_rows = unnest_object_to_list(rule_binding_collection)
+        rule_bindings = []
         for record in rule_bindings_rows:
             try:
-                dq_rule_binding.DqRuleBinding.from_dict(
-                    rule_binding_id=record["id"], kwargs=record, validate_uri=False
+                rule_binding = self.get_validated_config(
+                    "rule_bindings", record["id"], record, validated_configs
                 )
             except Exception as e:
                 raise ValueError(f"Failed to parse Rule Binding with error:\n{e}\n")
+            rule_bindings.append(rule_binding)
             if "entity_uri" not in record:
                 record.update({"entity_uri": None})
         self._cache_db["rule_bindings"].upsert_all(
             rule_bindings_rows, pk="id", alter=True
         )
+        self.load_rule_binding_links(rule_bindings)
+
+    def create_rule_binding_link_tables(self) -> None:
+        for link_table_name, (config_id_column, pk) in RULE_BINDING_LINK_TABLES.items():
+            columns = {"rule_binding_id": str, config_id_column: str}
+            if "position" in pk:
+                columns["position"] = int
+            self._cache_db[link_table_name].create(
+                columns, pk=pk if len(pk) > 1 else pk[0], if_not_exists=True
+            )
+            self._cache_db[link_table_name].create_index(
+                [config_id_column, "rule_binding_id"], if_not_exists=True
+            )
 
-    def load_all_entities_collection(self, entities_collection: dict) -> None:
+    def load_rule_binding_links(
+        self, rule_bindings: list[dq_rule_binding.DqRuleBinding]
+    ) -> None:
+        self.create_rule_binding_link_tables()
+        rule_binding_ids = [rule_binding.rule_binding_id for rule_binding in rule_bindings]
+        for link_table_name in RULE_BINDING_LINK_TABLES:
+            self.delete_configs(link_table_name, rule_binding_ids, pk="rule_binding_id")
+        self._cache_db["rule_binding_entities"].insert_all(
+            {
+                "rule_binding_id": rule_binding.rule_binding_id,
+                "entity_id": rule_binding.entity_id.upper(),
+            }
+            for rule_binding in rule_bindings
+            if rule_binding.entity_id
+        )
+        self._cache_db["rule_binding_row_filters"].insert_all(
+            {
+                "rule_binding_id": rule_binding.rule_binding_id,
+                "row_filter_id": rule_binding.row_filter_id.upper(),
+            }
+            for rule_binding in rule_bindings
+            if rule_binding.row_filter_id
+        )
+        self._cache_db["rule_binding_rules"].insert_all(
+            {
+                "rule_binding_id": rule_binding.rule_binding_id,
+                "rule_id": rule_id.upper(),
+                "position": position,
+            }
+            for rule_binding in rule_bindings
+            for position, rule_id in enumerate(rule_binding.get_rule_ids())
+        )
+
+    def load_all_entities_collection(
+        self, entities_collection: dict, validated_configs: dict | None = None
+    ) -> None:
         logger.debug(
             f"Loading 'entities' configs into cache:\n{pformat(entities_collection.keys())}"
         )
         enriched_entities_configs = {}
         for entity_id, entity_configs in entities_collection.items():
-            entity = dq_entity.DqEntity.from_dict(entity_id, entity_configs)
+            entity = self.get_validated_config(
+                "entities", entity_id, entity_configs, validated_configs
+            )
             logger.info(f"load_all_entities_collection:entity{entity}\nentity_configs:{pformat(entity_configs)}")
             enriched_entities_configs.update(entity.to_dict())
         logger.debug(
             f"entities_collection:\n{pformat(entities_collection)}\n"
             f"enriched_entities_configs:\n{pformat(enriched_entities_configs)}"
         )
+        self.invalidate_resolved_configs("entities")
         self._cache_db["entities"].upsert_all(
             unnest_object_to_list(enriched_entities_configs), pk="id", alter=True
         )
 
-    def load_all_row_filters_collection(self, row_filters_collection: dict) -> None:
+    def load_all_row_filters_collection(
+        self, row_filters_collection: dict, validated_configs: dict | None = None
+    ) -> None:
         logger.debug(
             f"Loading 'row_filters' configs into cache:\n{pformat(row_filters_collection.keys())}"
         )
         for row_filter_id, row_filter_record in row_filters_collection.items():
             try:
-                dq_row_filter.DqRowFilter.from_dict(
-                    row_filter_id=row_filter_id, kwargs=row_filter_record
+                self.get_validated_config(
+                    "row_filters", row_filter_id, row_filter_record, validated_configs
                 )
             except Exception as e:
                 raise ValueError(f"Failed to parse Row Filter with error:\n{e}\n")
+        self.invalidate_resolved_configs("row_filters")
         self._cache_db["row_filters"].upsert_all(
             unnest_object_to_list(row_filters_collection), pk="id", alter=True
         )
 
     def load_all_reference_columns_collection(
-        self, reference_columns_collection: dict
+        self, reference_columns_collection: dict, validated_configs: dict | None = None
     ) -> None:
         logger.debug(
             f"Loading 'reference_columns' configs into cache:\n{pformat(reference_columns_collection.keys())}"
@@ -220,27 +653,35 @@ class DqConfigsCache:
             reference_columns_record,
         ) in reference_columns_collection.items():
             try:
-                dq_reference_columns.DqReferenceColumns.from_dict(
-                    reference_columns_id=reference_columns_id,
-                    kwargs=reference_columns_record,
+                self.get_validated_config(
+                    "reference_columns",
+                    reference_columns_id,
+                    reference_columns_record,
+                    validated_configs,
                 )
             except Exception as e:
                 raise ValueError(
                     f"Failed to parse Reference Columns with error:\n{e}\n"
                 )
+        self.invalidate_resolved_configs("reference_columns")
         self._cache_db["reference_columns"].upsert_all(
             unnest_object_to_list(reference_columns_collection), pk="id", alter=True
         )
 
-    def load_all_rules_collection(self, rules_collection: dict) -> None:
+    def load_all_rules_collection(
+        self, rules_collection: dict, validated_configs: dict | None = None
+    ) -> None:
         logger.debug(
             f"Loading 'rules' configs into cache:\n{pformat(rules_collection.keys())}"
         )
         for rules_id, rules_record in rules_collection.items():
             try:
-                dq_rule.DqRule.from_dict(rule_id=rules_id, kwargs=rules_record)
+                self.get_validated_config(
+                    "rules", rules_id, rules_record, validated_configs
+                )
             except Exception as e:
                 raise ValueError(f"Failed to parse Rule with error:\n{e}\n")
+        self.invalidate_resolved_configs("rules")
         self._cache_db["rules"].upsert_all(
             unnest_object_to_list(rules_collection), pk="id", alter=True
         )
@@ -257,65 +698,88 @@ class DqConfigsCache:
             alter=True,
         )
 
-    def update_config(
-        configs_type: str, config_old: list | dict, config_new: list | dict
-    ) -> list | dict:
-        if configs_type == "rule_dimensions":
-            return DqConfigsCache.update_config_lists(config_old, config_new)
-        else:
-            return DqConfigsCache.update_config_dicts(config_old, config_new)
+    def get_config_files(self) -> dict[str, dict]:
+        if self._cache_db[CONFIG_FILES_TABLE].exists():
+            config_files = {
+                record["path"]: record
+                for record in self._cache_db[CONFIG_FILES_TABLE].rows
+            }
+            if all(
+                record["cache_version"] == CONFIGS_CACHE_VERSION
+                for record in config_files.values()
+            ):
+                return config_files
+        # Either a fresh database or one written without (or with an older)
+        # file tracking: drop everything so it is rebuilt from the YAML files.
+        logger.info("Rebuilding configs cache from scratch.")
+        for table_name in (
+            CONFIG_TABLES
+            + tuple(RULE_BINDING_LINK_TABLES)
+            + (CONFIG_FILES_TABLE, CONFIG_SOURCES_TABLE)
+        ):
+            if self._cache_db[table_name].exists():
+                self._cache_db[table_name].drop()
+        self.create_rule_binding_link_tables()
+        return {}
 
-    def update_config_dicts(config_old: dict, config_new: dict) -> dict:
+    def get_config_sources(self) -> dict[str, dict[str, typing.Any]]:
+        config_sources: dict[str, dict[str, typing.Any]] = {}
+        if not self._cache_db[CONFIG_SOURCES_TABLE].exists():
+            return config_sources
+        for record in self._cache_db[CONFIG_SOURCES_TABLE].rows:
+            config_sources.setdefault(record["path"], {})[
+                record["config_type"]
+            ] = json.loads(record["config_json"])
+        return config_sources
 
-        if not config_old and not config_new:
-            return {}
-        elif not config_old:
-            return config_new.copy()
-        elif not config_new:
-            return config_old.copy()
-        else:
-            intersection = config_old.keys() & config_new.keys()
-
-            # The new config defines keys that we have already loaded
-            if intersection:
-                # Verify that objects pointed to by duplicate keys are identical
-                config_old_i = {}
-                config_new_i = {}
-                for k in intersection:
-                    config_old_i[k] = config_old[k]
-                    config_new_i[k] = config_new[k]
-
-                # == on dicts performs deep compare:
-                if not config_old_i == config_new_i:
-                    raise ValueError(
-                        f"Detected Duplicated Config ID(s): {intersection}. "
-                        f"If a config ID is repeated, it must be for an identical "
-                        f"configuration.\n"
-                        f"Duplicated config contents:\n"
-                        f"{pformat(config_old_i)}\n"
-                        f"{pformat(config_new_i)}"
-                    )
-
-            updated = config_old.copy()
-            updated.update(config_new)
-            return updated
-
-    def update_config_lists(config_old: list, config_new: list) -> list:
-
-        if not config_old and not config_new:
-            return []
-        elif not config_old:
-            return config_new.copy()
-        elif not config_new:
-            return config_old.copy()
-        else:
-            # Both lists contain data. This is only OK if they are identical.
-            if not sorted(config_old) == sorted(config_new):
-                raise ValueError(
-                    f"Detected Duplicated Config: {config_new}."
-                    f"If a config is repeated, it must be identical."
-                )
-            return config_old.copy()
+    def save_config_files(
+        self,
+        file_records: list[dict],
+        changed_config_sources: dict[str, dict[str, typing.Any]],
+        deleted_paths: list[str],
+    ) -> None:
+        with self._cache_db.conn:
+            stale_paths = list(changed_config_sources.keys()) + list(deleted_paths)
+            self.delete_configs(CONFIG_FILES_TABLE, deleted_paths, pk="path")
+            self.delete_configs(CONFIG_SOURCES_TABLE, stale_paths, pk="path")
+            self._cache_db[CONFIG_FILES_TABLE].upsert_all(
+                [
+                    {**record, "cache_version": CONFIGS_CACHE_VERSION}
+                    for record in file_records
+                ],
+                pk="path",
+                alter=True,
+            )
+            self._cache_db[CONFIG_SOURCES_TABLE].insert_all(
+                [
+                    {
+                        "path": path,
+                        "config_type": config_type,
+                        "config_json": json.dumps(config, default=str),
+                    }
+                    for path, file_configs in changed_config_sources.items()
+                    for config_type, config in file_configs.items()
+                ],
+                pk=("path", "config_type"),
+                replace=True,
+            )
+
+    def delete_configs(
+        self, table_name: str, config_ids: typing.Iterable[str], pk: str = "id"
+    ) -> None:
+        config_ids = list(config_ids)
+        if not config_ids or not self._cache_db[table_name].exists():
+            return
+        logger.debug(f"Deleting from '{table_name}' configs cache: {config_ids}")
+        self.invalidate_resolved_configs(table_name)
+        for index in range(0, len(config_ids), SQLITE_MAX_VARIABLES):
+            chunk = config_ids[index:index + SQLITE_MAX_VARIABLES]
+            self._cache_db[table_name].delete_where(
+                f"{pk} in ({','.join('?' for _ in chunk)})", chunk
+            )
+        if table_name == "rule_bindings":
+            for link_table_name in RULE_BINDING_LINK_TABLES:
+                self.delete_configs(link_table_name, config_ids, pk="rule_binding_id")
 
     def get_entities_configs_from_rule_bindings(
         self, target_rule_binding_ids: list[str]
@@ -30,6 +30,47 @@ ENTITY_CUSTOM_CONFIG_MAPPING = {
 
 logger = getlogger()
 
+# Granularities of a partition field holding the table's snapshot date. The
+# field restricts the scan to the snapshots requested with --snapshot_date.
+SNAPSHOT_GRANULARITIES = ("DAILY", "MONTHLY")
+
+
+def validate_partition_fields(entity_id: str, partition_fields: list) -> list:
+    """Partition fields of an entity with their granularity upper-cased.
+
+    Each field is a dictionary with a 'name' and, for at most one field, a
+    'granularity' of DAILY or MONTHLY marking it as the snapshot column.
+    """
+    if type(partition_fields) != list:
+        raise ValueError(
+            f"Entity Config ID '{entity_id}' has invalid partition_fields with type "
+            f"{type(partition_fields)} and values: {partition_fields}\n"
+            "'partition_fields' must be of type list."
+        )
+    validated_partition_fields = []
+    for field in partition_fields:
+        get_from_dict_and_assert(config_id=entity_id, kwargs=field, key="name")
+        if field.get("granularity"):
+            field = {**field, "granularity": field["granularity"].upper()}
+            if field["granularity"] not in SNAPSHOT_GRANULARITIES:
+                raise ValueError(
+                    f"Entity Config ID '{entity_id}' partition field "
+                    f"'{field['name']}' has unsupported granularity "
+                    f"'{field['granularity']}'. "
+                    f"Supported values: {SNAPSHOT_GRANULARITIES}."
+                )
+        validated_partition_fields.append(field)
+    if len(get_snapshot_partition_fields(validated_partition_fields)) > 1:
+        raise ValueError(
+            f"Entity Config ID '{entity_id}' has more than one partition field "
+            f"with a granularity: {validated_partition_fields}."
+        )
+    return validated_partition_fields
+
+
+def get_snapshot_partition_fields(partition_fields: list | None) -> list:
+    return [field for field in partition_fields or [] if field.get("granularity")]
+
 
 def get_custom_entity_configs(
     entity_id: str, configs_map: dict, source_database: str, config_key: str
@@ -139,6 +180,8 @@ class DqEntity:
 
 
         partition_fields = kwargs.get("partition_fields")
+        if partition_fields:
+            partition_fields = validate_partition_fields(entity_id, partition_fields)
 
         logger.info(f"kwargs from columns_dict:{kwargs},entity_id:{entity_id}")
 
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from enum import unique
+
+import itertools
+import threading
+import time
+import typing
+
+from integration.redshift.redshiftclient import get_batch_row_count
+from logger import getlogger
+
+if typing.TYPE_CHECKING:
+    from integration.redshift.redshiftclient import RedshiftClient
+
+logger = getlogger()
+
+
+@unique
+class DqExecutionStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+
+
+@dataclass
+class DqExecutionStatement:
+    """One SQL statement of a job.
+
+    rule_binding_id is None for statements shared by every rule binding of the
+    job, such as the shared entity data scan and dropping its temp table.
+    The rows of a statement with stream_results are fetched in batches.
+    """
+
+    rule_binding_id: str | None
+    sql_string_key: str
+    sql_string: str
+    parameters: dict | None = None
+    stream_results: bool = False
+
+
+@dataclass
+class DqExecutionJob:
+    """Statements run in order on one Redshift session.
+
+    Rule bindings reading the same session temp table have to be in the same
+    job. Jobs with a higher priority are started first, in submission order
+    otherwise.
+    """
+
+    job_id: str
+    entity_id: str
+    statements: list[DqExecutionStatement]
+    priority: int = 0
+
+    def get_rule_binding_ids(self: DqExecutionJob) -> list[str]:
+        return list(
+            dict.fromkeys(
+                statement.rule_binding_id
+                for statement in self.statements
+                if statement.rule_binding_id
+            )
+        )
+
+
+@dataclass
+class DqRuleBindingExecution:
+    rule_binding_id: str
+    job_id: str
+    entity_id: str
+    status: DqExecutionStatus = DqExecutionStatus.QUEUED
+    queued_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+    row_counts: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+    def get_queued_seconds(self: DqRuleBindingExecution) -> float | None:
+        if self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    def get_run_seconds(self: DqRuleBindingExecution) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self: DqRuleBindingExecution) -> dict:
+        return {
+            "job_id": self.job_id,
+            "entity_id": self.entity_id,
+            "status": self.status.value,
+            "queued_seconds": self.get_queued_seconds(),
+            "run_seconds": self.get_run_seconds(),
+            "row_counts": self.row_counts,
+            "error": self.error,
+        }
+
+
+class DqExecutionScheduler:
+    """Runs rule binding SQL on Redshift with bounded concurrency.
+
+    At most max_concurrency jobs run at once, matching the WLM query slots
+    available to DQ runs, and at most max_concurrency_per_entity of them
+    read the same entity. Queued jobs are started by priority, then in
+    submission order, skipping over jobs whose entity is at its cap.
+
+    result_handler, if set, is called from the job's thread with each batch
+    of result rows of a statement, and the whole result of the others.
+    Streamed batches are column batches if result_format is 'numpy' or
+    'arrow', see RedshiftClient.stream_query_columns.
+    """
+
+    def __init__(
+        self,
+        redshift_client: RedshiftClient,
+        max_concurrency: int = 1,
+        max_concurrency_per_entity: int | None = None,
+        fetch_batch_size: int | None = None,
+        result_format: str = "rows",
+        result_handler: typing.Callable[[DqExecutionStatement, typing.Sequence], None]
+        | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1. Current value: {max_concurrency}"
+            )
+        if max_concurrency_per_entity is not None and max_concurrency_per_entity < 1:
+            raise ValueError(
+                f"max_concurrency_per_entity must be at least 1. "
+                f"Current value: {max_concurrency_per_entity}"
+            )
+        self._redshift_client = redshift_client
+        self._max_concurrency = max_concurrency
+        self._max_concurrency_per_entity = max_concurrency_per_entity
+        self._fetch_batch_size = fetch_batch_size
+        self._result_format = result_format
+        self._result_handler = result_handler
+        self._queue: list[tuple[int, int, DqExecutionJob]] = []
+        self._sequence = itertools.count()
+        self._running_per_entity: dict[str, int] = {}
+        self._running = 0
+        self._max_running = 0
+        self._condition = threading.Condition()
+        self.executions: dict[str, DqRuleBindingExecution] = {}
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def submit(self, job: DqExecutionJob) -> None:
+        queued_at = time.perf_counter()
+        with self._condition:
+            for rule_binding_id in job.get_rule_binding_ids():
+                if rule_binding_id in self.executions:
+                    raise ValueError(
+                        f"Rule binding {rule_binding_id} is already scheduled "
+                        f"in job {self.executions[rule_binding_id].job_id}."
+                    )
+                self.executions[rule_binding_id] = DqRuleBindingExecution(
+                    rule_binding_id=rule_binding_id,
+                    job_id=job.job_id,
+                    entity_id=job.entity_id,
+                    queued_at=queued_at,
+                )
+            self._queue.append((-job.priority, next(self._sequence), job))
+            self._queue.sort(key=lambda item: item[:2])
+            self._condition.notify_all()
+
+    def run(self) -> dict[str, DqRuleBindingExecution]:
+        """Run every submitted job and return the executions by rule binding."""
+        self.started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            with self._condition:
+                while self._queue or self._running:
+                    job = self._pop_runnable_job()
+                    if job is None:
+                        self._condition.wait()
+                        continue
+                    self._running += 1
+                    self._max_running = max(self._max_running, self._running)
+                    self._running_per_entity[job.entity_id] = (
+                        self._running_per_entity.get(job.entity_id, 0) + 1
+                    )
+                    executor.submit(self._run_job, job)
+        self.finished_at = time.perf_counter()
+        return self.executions
+
+    def get_report(self) -> dict:
+        status_counts = {status.value: 0 for status in DqExecutionStatus}
+        for execution in self.executions.values():
+            status_counts[execution.status.value] += 1
+        run_seconds = [
+            execution.get_run_seconds()
+            for execution in self.executions.values()
+            if execution.get_run_seconds() is not None
+        ]
+        queued_seconds = [
+            execution.get_queued_seconds()
+            for execution in self.executions.values()
+            if execution.get_queued_seconds() is not None
+        ]
+        return {
+            "rule_bindings": len(self.executions),
+            "status_counts": status_counts,
+            "wall_seconds": (
+                self.finished_at - self.started_at
+                if self.started_at is not None and self.finished_at is not None
+                else None
+            ),
+            "total_run_seconds": sum(run_seconds),
+            "max_queued_seconds": max(queued_seconds, default=None),
+            "max_concurrency": self._max_concurrency,
+            "max_concurrency_per_entity": self._max_concurrency_per_entity,
+            "max_concurrency_reached": self._max_running,
+            "failed_rule_bindings": {
+                rule_binding_id: execution.error
+                for rule_binding_id, execution in self.executions.items()
+                if execution.status != DqExecutionStatus.SUCCEEDED
+            },
+        }
+
+    def _pop_runnable_job(self) -> DqExecutionJob | None:
+        # Called with the lock held.
+        if self._running >= self._max_concurrency:
+            return None
+        for index, (_, _, job) in enumerate(self._queue):
+            if (
+                self._max_concurrency_per_entity is None
+                or self._running_per_entity.get(job.entity_id, 0)
+                < self._max_concurrency_per_entity
+            ):
+                return self._queue.pop(index)[2]
+        return None
+
+    def _run_job(self, job: DqExecutionJob) -> None:
+        statement = None
+        try:
+            # One session for the whole job, so its temp tables stay visible.
+            with self._redshift_client.connection():
+                running_rule_binding_id = None
+                for statement in job.statements:
+                    if statement.rule_binding_id != running_rule_binding_id:
+                        # Rule bindings of a job run one after the other.
+                        if running_rule_binding_id:
+                            self._finish(
+                                running_rule_binding_id, DqExecutionStatus.SUCCEEDED
+                            )
+                        running_rule_binding_id = statement.rule_binding_id
+                        if running_rule_binding_id:
+                            self._start(running_rule_binding_id)
+                    self._run_statement(statement)
+            for rule_binding_id in job.get_rule_binding_ids():
+                self._finish(rule_binding_id, DqExecutionStatus.SUCCEEDED)
+        except Exception as error:
+            failed_rule_binding_id = statement.rule_binding_id if statement else None
+            logger.error(
+                f"Job {job.job_id} failed"
+                + (
+                    f" running {statement.sql_string_key} of rule binding "
+                    f"{failed_rule_binding_id}"
+                    if statement
+                    else ""
+                )
+                + f": {error}"
+            )
+            for rule_binding_id in job.get_rule_binding_ids():
+                if failed_rule_binding_id in (None, rule_binding_id):
+                    self._finish(rule_binding_id, DqExecutionStatus.FAILED, str(error))
+                else:
+                    self._finish(
+                        rule_binding_id,
+                        DqExecutionStatus.SKIPPED,
+                        f"Skipped after rule binding {failed_rule_binding_id} "
+                        f"failed in job {job.job_id}.",
+                    )
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._running_per_entity[job.entity_id] -= 1
+                self._condition.notify_all()
+
+    def _run_statement(self, statement: DqExecutionStatement) -> None:
+        if statement.stream_results:
+            stream_options = {}
+            if self._fetch_batch_size:
+                stream_options["batch_size"] = self._fetch_batch_size
+            if self._result_format != "rows":
+                batches = self._redshift_client.stream_query_columns(
+                    query_string=statement.sql_string,
+                    parameters=statement.parameters,
+                    output_format=self._result_format,
+                    **stream_options,
+                )
+            else:
+                batches = self._redshift_client.stream_query(
+                    query_string=statement.sql_string,
+                    parameters=statement.parameters,
+                    **stream_options,
+                )
+        else:
+            batches = [
+                self._redshift_client.execute_query(
+                    query_string=statement.sql_string,
+                    parameters=statement.parameters,
+                )
+            ]
+        row_count = 0
+        for batch in batches:
+            if self._result_handler:
+                self._result_handler(statement, batch)
+            row_count += get_batch_row_count(batch)
+        if statement.rule_binding_id:
+            self.executions[statement.rule_binding_id].row_counts[
+                statement.sql_string_key
+            ] = row_count
+
+    def _start(self, rule_binding_id: str) -> None:
+        execution = self.executions[rule_binding_id]
+        execution.status = DqExecutionStatus.RUNNING
+        execution.started_at = time.perf_counter()
+
+    def _finish(
+        self,
+        rule_binding_id: str,
+        status: DqExecutionStatus,
+        error: str | None = None,
+    ) -> None:
+        execution = self.executions[rule_binding_id]
+        if execution.status in (
+            DqExecutionStatus.SUCCEEDED,
+            DqExecutionStatus.FAILED,
+            DqExecutionStatus.SKIPPED,
+        ):
+            return
+        execution.status = status
+        execution.finished_at = time.perf_counter()
+        execution.error = error
+        logger.info(
+            f"Rule binding {rule_binding_id} {status.value.lower()}"
+            + (
+                f" in {execution.get_run_seconds():.3f}s"
+                if execution.get_run_seconds() is not None
+                else ""
+            )
+        )
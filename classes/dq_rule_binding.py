@@ -22,6 +22,48 @@ import classes.dq_configs_cache as dq_configs_cache
 logger = getlogger()
 
 
+def validate_sampling_configs(config_id: str, sampling: dict) -> dict:
+    """Normalized sampling configs of a rule binding or the CLI.
+
+    Exactly one of 'fraction' (0 < fraction <= 1) or 'rows' (> 0) must be set.
+    'key_columns' is a list or comma-separated string of columns hashed to
+    pick the sampled rows deterministically. If it is empty the rule
+    binding's include_reference_columns are used, and a rule binding with
+    neither cannot be sampled.
+    """
+    if type(sampling) != dict:
+        raise ValueError(
+            f"Config ID: {config_id} has invalid sampling field with type "
+            f"{type(sampling)} and values: {sampling}\n"
+            "'sampling' must be of type dictionary."
+        )
+    sample_size = get_keys_from_dict_and_assert_oneof(
+        config_id=config_id,
+        kwargs=sampling,
+        keys=["fraction", "rows"],
+    )
+    fraction = sample_size.get("fraction")
+    rows = sample_size.get("rows")
+    if fraction is not None and not 0 < float(fraction) <= 1:
+        raise ValueError(
+            f"Config ID: {config_id} sampling 'fraction' must be greater than 0 "
+            f"and at most 1. Current value: {fraction}"
+        )
+    if rows is not None and int(rows) <= 0:
+        raise ValueError(
+            f"Config ID: {config_id} sampling 'rows' must be greater than 0. "
+            f"Current value: {rows}"
+        )
+    key_columns = sampling.get("key_columns") or []
+    if type(key_columns) == str:
+        key_columns = [column.strip() for column in key_columns.split(",")]
+    return {
+        "fraction": float(fraction) if fraction is not None else None,
+        "rows": int(rows) if rows is not None else None,
+        "key_columns": [column for column in key_columns if column],
+    }
+
+
 @dataclass
 class DqRuleBinding:
     """ """
@@ -34,6 +76,7 @@ class DqRuleBinding:
     rule_ids: list
     reference_columns_id: str | None
     metadata: dict | None
+    sampling: dict | None = None
 
     @classmethod
     def from_dict(
@@ -99,6 +142,11 @@ class DqRuleBinding:
                 f"metadata field with type {type(metadata)} and values: {metadata}\n"
                 "'metadata' must be of type dictionary."
             )
+        sampling: dict | None = kwargs.get("sampling", None)
+        if sampling:
+            sampling = validate_sampling_configs(rule_binding_id, sampling)
+        else:
+            sampling = None
         return DqRuleBinding(
             rule_binding_id=str(rule_binding_id).upper(),
             entity_id=entity_id,
@@ -108,6 +156,7 @@ class DqRuleBinding:
             rule_ids=rule_ids,
             reference_columns_id=reference_columns_id,
             metadata=metadata,
+            sampling=sampling,
         )
 
     def to_dict(self: DqRuleBinding) -> dict:
@@ -129,6 +178,7 @@ class DqRuleBinding:
                     "rule_ids": self.rule_ids,
                     "reference_columns_id": self.reference_columns_id,
                     "metadata": self.metadata,
+                    "sampling": self.sampling,
                 }
             }
         )
@@ -145,6 +195,14 @@ class DqRuleBinding:
 
         return dict(self.to_dict().get(self.rule_binding_id))
 
+    def get_rule_ids(self: DqRuleBinding) -> list[str]:
+        """Rule IDs referenced in rule_ids, without their arguments."""
+        return [
+            next(iter(rule)) if type(rule) == dict else rule
+            for rule in self.rule_ids
+            if rule
+        ]
+
     def resolve_table_entity_config(
         self: DqRuleBinding, configs_cache: dq_configs_cache.DqConfigsCache
     ) -> DqEntity:
@@ -307,6 +365,9 @@ class DqRuleBinding:
             else:
                 include_reference_columns = []
             print(f"rule_binding_id={self.rule_binding_id} and row_filter_configs={row_filter_config.dict_values()} ")
+            # Only present when set, so configs_hashsum of rule bindings
+            # without sampling is unchanged.
+            sampling_configs = {"sampling": self.sampling} if self.sampling else {}
             return dict(
                 {
                     "rule_binding_id": self.rule_binding_id,
@@ -322,6 +383,7 @@ class DqRuleBinding:
                     "row_filter_configs": dict(row_filter_config.dict_values()),
                     "incremental_time_filter_column": incremental_time_filter_column,
                     "metadata": self.metadata,
+                    **sampling_configs,
                 }
             )
         except Exception as error:
@@ -1,6 +1,10 @@
 from datetime import date
+import json
 from logger import getlogger
+from integration.redshift.redshiftclient import COLUMNAR_OUTPUT_FORMATS
 from integration.redshift.redshiftclient import RedshiftClient
+from integration.redshift.redshiftclient import get_batch_row_count
+from integration.redshift.redshiftclient import import_columnar_module
 
 
 logger = getlogger()
@@ -13,10 +17,15 @@ def load_target_summary_table(
     target_summary_table: str,
     dq_summary_table_name: str,
     summary_to_stdout: bool = False,
+    result_format: str = "rows",
 ):
     print(f"Inside load_target_table_from_redshift ")
-    print(f"redshift_client.is_table_exists(target_summary_table):{redshift_client.is_table_exists(target_summary_table)} ")
-    if redshift_client.is_table_exists(target_summary_table):
+    # Answered from the catalog cache after the first lookup.
+    target_summary_table_exists = redshift_client.is_table_exists(
+        table=target_summary_table, schema="data_sciences"
+    )
+    print(f"redshift_client.is_table_exists(target_summary_table):{target_summary_table_exists} ")
+    if target_summary_table_exists:
 
         query_string_load = f"""SELECT * FROM data_sciences.{dq_summary_table_name}
          WHERE invocation_id='{invocation_id}'
@@ -24,13 +33,15 @@ def load_target_summary_table(
 
         print(f"query_string_load:{query_string_load}")
 
-        result=redshift_client.execute_query(
+        num_loaded_rows = 0
+        for summary_batch in redshift_client.stream_query(
             query_string=query_string_load
-        )
+        ):
+            num_loaded_rows += len(summary_batch)
 
         logger.info(
             f"Table {target_summary_table} already exists "
-            f"and query results are appended to the table."
+            f"and {num_loaded_rows} query results are appended to the table."
         )
 
     else:
@@ -44,6 +55,9 @@ def load_target_summary_table(
         print(f"query_create_table string: {query_create_table}")
         # Create the summary table
         result=redshift_client.execute_query(query_string=query_create_table)
+        redshift_client.invalidate_catalog(
+            schema="data_sciences", table=target_summary_table
+        )
         print(f"Table created : {result} ")
 
         logger.info(
@@ -55,16 +69,71 @@ def load_target_summary_table(
         WHERE invocation_id='{invocation_id}'
         and DATE(execution_ts)='{partition_date}'"""
 
-    summary_data = redshift_client.execute_query(
-        query_string=query_string_affected
-    )
-
-    #if summary_to_stdout:
-    #    log_summary(summary_data)
+    # Counted batch by batch so the loaded rows are never all held in memory.
+    num_rows = 0
+    if summary_to_stdout and result_format in COLUMNAR_OUTPUT_FORMATS:
+        summary_batches = redshift_client.stream_query_columns(
+            query_string=query_string_affected, output_format=result_format
+        )
+    else:
+        summary_batches = redshift_client.stream_query(
+            query_string=query_string_affected
+        )
+    for summary_batch in summary_batches:
+        if summary_to_stdout:
+            log_summary(summary_batch)
+        num_rows += get_batch_row_count(summary_batch)
     logger.info(
-        f"Loaded {len(summary_data)} rows to {target_summary_table}."
+        f"Loaded {num_rows} rows to {target_summary_table}."
     )
-    return len(summary_data)
+    return num_rows
+
+
+def get_summary_columns(summary_batch) -> dict[str, list]:
+    """Column name to values of a column batch from stream_query_columns."""
+    if isinstance(summary_batch, dict):
+        return {
+            column_name: column.tolist()
+            for column_name, column in summary_batch.items()
+        }
+    return summary_batch.to_pydict()
+
+
+def get_summary_totals(summary_batch) -> dict[str, float]:
+    """Sums of the *_count columns of a column batch, skipping NULLs."""
+    totals = {}
+    if isinstance(summary_batch, dict):
+        numpy = import_columnar_module("numpy")
+        for column_name, column in summary_batch.items():
+            if column_name.endswith("_count"):
+                values = column[numpy.not_equal(column, None)]
+                totals[column_name] = values.astype(float).sum().item()
+    else:
+        pyarrow_compute = import_columnar_module("pyarrow.compute")
+        for column_name in summary_batch.schema.names:
+            if column_name.endswith("_count"):
+                column_sum = pyarrow_compute.sum(
+                    summary_batch.column(column_name)
+                ).as_py()
+                totals[column_name] = float(column_sum or 0)
+    return totals
+
+
+def log_summary(summary_batch, rule_binding_id: str | None = None) -> None:
+    """Log a batch of summary results to stdout as one JSON line.
+
+    Column batches are serialized a column at a time, with totals of their
+    count columns; row batches as a list of rows.
+    """
+    summary_json = {}
+    if rule_binding_id:
+        summary_json["rule_binding_id"] = rule_binding_id
+    if isinstance(summary_batch, (list, tuple)):
+        summary_json["rows"] = summary_batch
+    else:
+        summary_json["columns"] = get_summary_columns(summary_batch)
+        summary_json["totals"] = get_summary_totals(summary_batch)
+    print(json.dumps(summary_json, default=str))
 
 
 class TargetTable:
@@ -82,6 +151,7 @@ class TargetTable:
         target_summary_table: str,
         dq_summary_table_name: str,
         summary_to_stdout: bool = False,
+        result_format: str = "rows",
     ) -> int:
         try:
 
@@ -92,6 +162,7 @@ class TargetTable:
                 target_summary_table=target_summary_table,
                 dq_summary_table_name=dq_summary_table_name,
                 summary_to_stdout=summary_to_stdout,
+                result_format=result_format,
             )
             return num_rows
 
@@ -1,4 +1,7 @@
 from __future__ import annotations
+import contextlib
+import importlib
+import itertools
 import json
 from pathlib import Path
 from string import Template
@@ -6,6 +9,9 @@ import redshift_connector as redshift
 import logging
 from logger import getlogger
 import re
+import threading
+import time
+import typing
 
 REQUIRED_COLUMN_TYPES = {
     "created_at": "TIMESTAMP",
@@ -27,15 +33,274 @@ FROM (
 
 RE_EXTRACT_TABLE_NAME = ".*Not found: Table (.+?) was not found in.*"
 
+HEALTH_CHECK_QUERY = "SELECT 1"
+# Rows per FETCH of a server-side cursor. Single node clusters do not fetch
+# more than 1000 rows at a time.
+FETCH_BATCH_SIZE = 1000
+COLUMNAR_OUTPUT_FORMATS = ("numpy", "arrow")
+# Package each columnar output format needs.
+COLUMNAR_OUTPUT_MODULES = {"numpy": "numpy", "arrow": "pyarrow"}
+CATALOG_TTL_SECONDS = 300.0
+# Tables without columns, such as some late binding views, still get a row.
+CATALOG_QUERY = """
+SELECT
+    t.table_name,
+    c.column_name,
+    c.data_type
+FROM information_schema.tables t
+LEFT JOIN information_schema.columns c
+    ON c.table_schema = t.table_schema
+    AND c.table_name = t.table_name
+WHERE t.table_schema = :schema_name
+ORDER BY t.table_name, c.ordinal_position
+"""
+
+
+class RedshiftConnectionPool:
+    """Bounded pool of Redshift connections shared by threads.
+
+    A connection is used by one thread at a time: acquire checks one out,
+    waiting while max_size connections are in use, and release returns it.
+    Connections idle for longer than max_idle_seconds are closed, and one
+    idle for longer than health_check_seconds runs HEALTH_CHECK_QUERY before
+    it is handed out again.
+    """
+
+    def __init__(
+        self,
+        connection_factory: typing.Callable[[], redshift.Connection],
+        max_size: int = 8,
+        max_idle_seconds: float = 300.0,
+        health_check_seconds: float = 30.0,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(f"Connection pool max_size must be at least 1: {max_size}")
+        self._connection_factory = connection_factory
+        self._max_size = max_size
+        self._max_idle_seconds = max_idle_seconds
+        self._health_check_seconds = health_check_seconds
+        # Most recently returned last, so the warmest connection is reused.
+        self._idle_connections: list[tuple[redshift.Connection, float]] = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float | None = None) -> redshift.Connection:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            connection, idle_since = None, None
+            with self._condition:
+                expired = self._pop_expired_connections()
+                while not self._idle_connections and self._size >= self._max_size:
+                    if self._closed:
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(
+                            f"No Redshift connection available within {timeout} "
+                            f"seconds, all {self._max_size} are in use."
+                        )
+                    self._condition.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("Redshift connection pool is closed.")
+                if self._idle_connections:
+                    connection, idle_since = self._idle_connections.pop()
+                else:
+                    self._size += 1
+            self._close_connections(expired)
+            if connection is None:
+                try:
+                    return self._connection_factory()
+                except Exception:
+                    self._forget_connection()
+                    raise
+            if time.monotonic() - idle_since < self._health_check_seconds:
+                return connection
+            if self.is_healthy(connection):
+                return connection
+            logger.info("Discarding Redshift connection that failed its health check.")
+            self.release(connection, discard=True)
+
+    def release(self, connection: redshift.Connection, discard: bool = False) -> None:
+        with self._condition:
+            if not (discard or self._closed):
+                self._idle_connections.append((connection, time.monotonic()))
+                self._condition.notify()
+                return
+        self._close_connections([connection])
+        self._forget_connection()
+
+    @contextlib.contextmanager
+    def connection(
+        self, timeout: float | None = None
+    ) -> typing.Iterator[redshift.Connection]:
+        """Check out a connection for the duration of the with block.
+
+        A query error aborts the connection's transaction, so it is rolled
+        back before the connection is returned, or discarded if that fails.
+        """
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            # Also reached when a generator holding the connection is closed.
+            self.release(connection, discard=discard)
+
+    def close(self) -> None:
+        """Close the idle connections, and the others as they are released."""
+        with self._condition:
+            self._closed = True
+            connections = [connection for connection, _ in self._idle_connections]
+            self._idle_connections = []
+            self._size -= len(connections)
+            self._condition.notify_all()
+        self._close_connections(connections)
+
+    def get_stats(self) -> dict:
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle_connections),
+                "max_size": self._max_size,
+            }
+
+    @staticmethod
+    def is_healthy(connection: redshift.Connection) -> bool:
+        try:
+            cur = connection.cursor()
+            cur.execute(HEALTH_CHECK_QUERY)
+            cur.fetchall()
+            return True
+        except Exception as e:
+            logger.warning(f"Redshift connection health check failed: {e}")
+            return False
+
+    def _pop_expired_connections(self) -> list[redshift.Connection]:
+        # Called with the lock held; the connections are closed after it is released.
+        now = time.monotonic()
+        expired = [
+            connection
+            for connection, idle_since in self._idle_connections
+            if now - idle_since > self._max_idle_seconds
+        ]
+        if expired:
+            self._idle_connections = [
+                (connection, idle_since)
+                for connection, idle_since in self._idle_connections
+                if now - idle_since <= self._max_idle_seconds
+            ]
+            self._size -= len(expired)
+            self._condition.notify(len(expired))
+        return expired
+
+    def _forget_connection(self) -> None:
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close_connections(connections: list[redshift.Connection]) -> None:
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Redshift connection: {e}")
+
+
+class RedshiftCatalogCache:
+    """Table and column metadata of Redshift schemas, kept in memory.
+
+    The first lookup in a schema loads the columns and data types of all its
+    tables with one query, and later lookups are answered from memory until
+    the schema is ttl_seconds old. Call invalidate after DDL changing the
+    schema so the next lookup sees the change.
+    """
+
+    def __init__(
+        self,
+        catalog_loader: typing.Callable[[str], dict[str, dict[str, str]]],
+        ttl_seconds: float = CATALOG_TTL_SECONDS,
+    ) -> None:
+        if ttl_seconds < 0:
+            raise ValueError(
+                f"ttl_seconds must not be negative. Current value: {ttl_seconds}"
+            )
+        self._catalog_loader = catalog_loader
+        self._ttl_seconds = ttl_seconds
+        # Loads run with the lock held, so threads asking for the same
+        # schema at once do not each query the catalog.
+        self._lock = threading.RLock()
+        self._schemas: dict[str, tuple[dict[str, dict[str, str]], float]] = {}
+        self._loads = 0
+        self._hits = 0
+
+    def get_tables(self, schema: str) -> dict[str, dict[str, str]]:
+        """Column data types by column name, by table name, of a schema."""
+        schema = schema.lower()
+        with self._lock:
+            cached = self._schemas.get(schema)
+            if cached and time.monotonic() - cached[1] <= self._ttl_seconds:
+                self._hits += 1
+                return cached[0]
+            tables = self._catalog_loader(schema)
+            self._schemas[schema] = (tables, time.monotonic())
+            self._loads += 1
+            logger.debug(f"Loaded catalog of {len(tables)} tables in schema {schema}")
+            return tables
+
+    def get_table_columns(self, table: str, schema: str) -> dict[str, str] | None:
+        """Column data types of a table, or None if it does not exist."""
+        return self.get_tables(schema).get(table.lower())
+
+    def invalidate(self, schema: str | None = None, table: str | None = None) -> None:
+        """Drop cached metadata of a schema, or of every schema if None.
+
+        The whole schema is reloaded on the next lookup, so table only
+        makes a difference for logging.
+        """
+        with self._lock:
+            if schema is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(schema.lower(), None)
+        logger.debug(
+            "Invalidated catalog of "
+            + (f"schema {schema}" if schema else "all schemas")
+            + (f" after changing table {table}" if table else "")
+        )
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_schemas": len(self._schemas),
+                "loads": self._loads,
+                "hits": self._hits,
+                "ttl_seconds": self._ttl_seconds,
+            }
+
 
 class RedshiftClient:
     logger.info("Hi")
-    _client: redshift = None
 
     def __init__(
         self,
         redshift_credentials=None,
+        max_connections: int = 8,
+        max_idle_seconds: float = 300.0,
+        catalog_ttl_seconds: float = CATALOG_TTL_SECONDS,
     ) -> None:
+        # redshift_connector connections must not be shared between threads,
+        # so every query checks one out of the pool. A thread inside a
+        # connection() block keeps using the connection it checked out.
+        self._thread_local = threading.local()
+        self._cursor_ids = itertools.count()
         if redshift_credentials:
             pass
         else:
@@ -46,88 +311,300 @@ class RedshiftClient:
                 password='sn+kkoDuhTYb+p94Bftr2A=='
             )
 
+        self._pool = RedshiftConnectionPool(
+            connection_factory=self.create_connection,
+            max_size=max_connections,
+            max_idle_seconds=max_idle_seconds,
+        )
+        self._catalog_cache = RedshiftCatalogCache(
+            catalog_loader=self.load_catalog, ttl_seconds=catalog_ttl_seconds
+        )
+
     def __repr__(self):
         return json.dumps(self._redshift_credentials)
 
-    def get_connection(
-        self, new: bool = False
-    ) -> redshift.connect:
-        """Creates return new Singleton database connection"""
-        if self._client is None or new:
+    def create_connection(self) -> redshift.Connection:
+        try:
+            return redshift.connect(**self._redshift_credentials)
+        except redshift.error.Error as e:
+            raise RuntimeError(f"Error message - {e}")
+
+    @contextlib.contextmanager
+    def connection(self) -> typing.Iterator[redshift.Connection]:
+        """Connection from the pool used by every query in the with block.
+
+        Temp tables live in the session that created them, so statements
+        sharing one must run inside the same connection() block.
+        """
+        client = getattr(self._thread_local, "client", None)
+        if client is not None:
+            yield client
+            return
+        with self._pool.connection() as client:
+            self._thread_local.client = client
             try:
-                self._client = redshift.connect(**self._redshift_credentials)
-            except redshift.error.Error as e:
-                raise f"Error message - {e}"
-            return self._client
-        else:
-            return self._client
+                yield client
+            finally:
+                self._thread_local.client = None
 
     def close_connection(self) -> None:
-        if self._client:
-            self._client.close()
+        self._pool.close()
+
+    def get_pool_stats(self) -> dict:
+        return self._pool.get_stats()
+
+    def get_catalog_stats(self) -> dict:
+        return self._catalog_cache.get_stats()
+
+    def invalidate_catalog(
+        self, schema: str | None = None, table: str | None = None
+    ) -> None:
+        """Forget cached table metadata after DDL in schema, or anywhere if None."""
+        self._catalog_cache.invalidate(schema=schema, table=table)
+
+    @staticmethod
+    def get_cursor(
+        client: redshift.Connection, parameters: dict | None = None
+    ) -> redshift.Cursor:
+        cur = client.cursor()
+        if parameters is not None:
+            # Bind parameters are written as :name in the query string.
+            cur.paramstyle = "named"
+        return cur
 
-    def check_query_dry_run(self, query_string: str) -> None:
+    def check_query_dry_run(
+        self, query_string: str, parameters: dict | None = None
+    ) -> None:
         """check whether query is valid."""
         try:
-            client=self.get_connection()
-            cur = client.cursor()
-            logger.info(f"Query executed: {query_string.strip()}")
-            query = CHECK_QUERY.safe_substitute(query_string=query_string.strip())
-            logger.info(f"Query after substitution: {query}")
-            cur.execute(query)
-            logger.info(f"Query executed successfully: {cur.redshift_rowcount}")
+            with self.connection() as client:
+                cur = self.get_cursor(client, parameters)
+                logger.info(f"Query executed: {query_string.strip()}")
+                query = CHECK_QUERY.safe_substitute(query_string=query_string.strip())
+                logger.info(f"Query after substitution: {query}")
+                cur.execute(query, parameters)
+                logger.info(f"Query executed successfully: {cur.redshift_rowcount}")
         except Exception as e:
             logger.error(f"Error message = {e}")
             raise e
 
+    def load_catalog(self, schema: str) -> dict[str, dict[str, str]]:
+        """Column data types by column name, by table name, of every table in schema."""
+        tables: dict[str, dict[str, str]] = {}
+        for table_name, column_name, data_type in self.execute_query(
+            query_string=CATALOG_QUERY, parameters={"schema_name": schema}
+        ):
+            columns = tables.setdefault(table_name, {})
+            if column_name is not None:
+                columns[column_name] = data_type
+        return tables
+
+    def get_table_columns(self, table: str, schema: str) -> dict[str, str] | None:
+        return self._catalog_cache.get_table_columns(table=table, schema=schema)
+
     def is_table_exists(self, table: str, schema: str) -> bool:
-        select_stmt = f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name ='{table}' AND table_schema='{schema}'"
-        client=self.get_connection()
-        cur = client.cursor()
-        cur.execute(select_stmt)
-        if cur.fetchone()[0] == 1:
-            return True
-        return False
+        return self.get_table_columns(table=table, schema=schema) is not None
 
     def assert_required_columns_exist_in_table(
         self, table: str
     ) -> dict:
         try:
-            client = self.get_connection()
-            table_ref = client.get_table(table)
-            column_names = {column.name for column in table_ref.schema}
+            schema, table_name = table.split(".")[-2:]
+            column_names = self.get_table_columns(table=table_name, schema=schema)
+            if column_names is None:
+                raise KeyError(f"Table {table} does not exist.")
             failures = {}
             for column_name, column_type in REQUIRED_COLUMN_TYPES.items():
                 if column_name not in column_names:
                     failures[
                         column_name
-                    ] = f"ALTER TABLE `{table}` ADD COLUMN {column_name} {column_type};\n"
+                    ] = f"ALTER TABLE {table} ADD COLUMN {column_name} {column_type};\n"
             if failures:
                 logger.info(
-                    f"Cannot find required column '{list(failures.keys())}' in BigQuery table '{table}'.\n"
+                    f"Cannot find required column '{list(failures.keys())}' in Redshift table '{table}'.\n"
                     f"These will created by running the following SQL script :\n"
                     "```\n" + "\n".join(failures.values()) + "```"
                 )
                 return failures
-        except KeyError as error:
+        except (KeyError, ValueError) as error:
             logger.fatal(f"Input table `{table}` is not valid.", exc_info=True)
             raise KeyError(f"\n\nInput table `{table}` is not valid.\n{error}")
 
     def execute_query(
         self,
         query_string: str,
+        parameters: dict | None = None,
     ):
         """
         The method is used to execute the sql query
         Parameters:
         query_string (str) : sql query to be executed
+        parameters (dict) : values for the :name bind parameters in query_string.
+            The connection caches the prepared statement for each query string,
+            so a query run again with new parameters is not parsed again.
         Returns:
             result of the sql execution is returned
         """
 
-        client=self.get_connection()
-        cur = client.cursor()
-        logger.info(f"Query executed: {query_string}")
-        cur.execute(query_string)
-        result=cur.fetchall()
+        with self.connection() as client:
+            cur = self.get_cursor(client, parameters)
+            logger.info(f"Query executed: {query_string}")
+            cur.execute(query_string, parameters)
+            # Statements such as CREATE TEMP TABLE have no result set.
+            result=cur.fetchall() if cur.description else []
         return result
+
+    def stream_query(
+        self,
+        query_string: str,
+        parameters: dict | None = None,
+        batch_size: int = FETCH_BATCH_SIZE,
+        server_side: bool = True,
+    ) -> typing.Iterator[tuple]:
+        """
+        The method is used to execute the sql query and yield its result in
+        batches of at most batch_size rows, so large results are never held
+        in memory at once.
+        Parameters:
+        query_string (str) : sql query to be executed
+        parameters (dict) : values for the :name bind parameters in query_string.
+        batch_size (int) : maximum number of rows per batch.
+        server_side (bool) : if True, the query runs as a DECLARE'd cursor read
+            with FETCH FORWARD, so the driver only buffers one batch. Redshift
+            allows one open cursor per session, so streams on one session
+            cannot be nested. If False, batches come from fetchmany, which
+            bounds the rows handed out but not what the driver buffers.
+        Returns:
+            iterator over the batches of rows of the result
+        """
+        for _, batch in self._stream_query_batches(
+            query_string, parameters, batch_size, server_side
+        ):
+            yield batch
+
+    def stream_query_columns(
+        self,
+        query_string: str,
+        parameters: dict | None = None,
+        batch_size: int = FETCH_BATCH_SIZE,
+        output_format: str = "numpy",
+        server_side: bool = True,
+    ) -> typing.Iterator[dict | typing.Any]:
+        """
+        The method is used to execute the sql query and yield its result in
+        column batches, as stream_query does in row batches.
+        This converts the format of each fetched batch only, it is not a
+        columnar fetch: redshift_connector decodes every result row into a
+        Python row, and its fetch_numpy_array and fetch_dataframe are built
+        from those rows too. What it saves is holding more than one batch of
+        row objects at a time and handling the result row by row afterwards.
+        Parameters:
+        query_string (str) : sql query to be executed
+        parameters (dict) : values for the :name bind parameters in query_string.
+        batch_size (int) : maximum number of rows per batch.
+        output_format (str) : 'numpy' for a dict of a numpy.ndarray per column,
+            or 'arrow' for a pyarrow.RecordBatch.
+        server_side (bool) : see stream_query.
+        Returns:
+            iterator over the column batches of the result
+        """
+        if output_format not in COLUMNAR_OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported columnar output format '{output_format}'. "
+                f"Supported values: {COLUMNAR_OUTPUT_FORMATS}."
+            )
+        to_columns = (
+            rows_to_numpy_columns if output_format == "numpy" else rows_to_arrow_record_batch
+        )
+        for column_names, batch in self._stream_query_batches(
+            query_string, parameters, batch_size, server_side
+        ):
+            yield to_columns(column_names, batch)
+
+    def _stream_query_batches(
+        self,
+        query_string: str,
+        parameters: dict | None,
+        batch_size: int,
+        server_side: bool,
+    ) -> typing.Iterator[tuple[list[str], tuple]]:
+        with self.connection() as client:
+            cur = self.get_cursor(client, parameters)
+            if not server_side:
+                logger.info(f"Query executed: {query_string}")
+                cur.execute(query_string, parameters)
+                if not cur.description:
+                    return
+                column_names = get_column_names(cur)
+                while True:
+                    batch = cur.fetchmany(batch_size)
+                    if not batch:
+                        return
+                    yield column_names, batch
+            cursor_name = f"dq_cursor_{next(self._cursor_ids)}"
+            declare_query = (
+                f"DECLARE {cursor_name} CURSOR FOR\n{query_string.strip().rstrip(';')}"
+            )
+            logger.info(f"Query executed: {declare_query}")
+            cur.execute(declare_query, parameters)
+            try:
+                while True:
+                    cur.execute(f"FETCH FORWARD {batch_size} FROM {cursor_name}")
+                    batch = cur.fetchall()
+                    if batch:
+                        yield get_column_names(cur), batch
+                    if len(batch) < batch_size:
+                        return
+            finally:
+                try:
+                    cur.execute(f"CLOSE {cursor_name}")
+                except Exception as e:
+                    # An aborted transaction already discarded the cursor.
+                    logger.warning(f"Failed to close cursor {cursor_name}: {e}")
+
+
+def get_column_names(cur: redshift.Cursor) -> list[str]:
+    return [column[0] for column in cur.description]
+
+
+def import_columnar_module(module_name: str) -> typing.Any:
+    # numpy and pyarrow are only needed for columnar fetches.
+    try:
+        return importlib.import_module(module_name)
+    except ModuleNotFoundError as error:
+        raise ModuleNotFoundError(
+            f"Columnar results require the '{module_name}' package. "
+            f"Install it with: pip install {module_name}"
+        ) from error
+
+
+def rows_to_numpy_columns(column_names: list[str], rows: typing.Sequence) -> dict:
+    """One numpy.ndarray per column of rows, transposed from the fetched rows.
+
+    Each column gets its own dtype: cursor.fetch_numpy_array builds a single
+    row-major array, which coerces mixed-type rows to one dtype.
+    """
+    numpy = import_columnar_module("numpy")
+    columns = zip(*rows) if rows else [()] * len(column_names)
+    return {
+        column_name: numpy.array(column)
+        for column_name, column in zip(column_names, columns)
+    }
+
+
+def rows_to_arrow_record_batch(column_names: list[str], rows: typing.Sequence) -> typing.Any:
+    """pyarrow.RecordBatch of rows, transposed from the fetched rows."""
+    pyarrow = import_columnar_module("pyarrow")
+    columns = zip(*rows) if rows else [()] * len(column_names)
+    return pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array(column) for column in columns], names=column_names
+    )
+
+
+def get_batch_row_count(batch: typing.Any) -> int:
+    """Rows in a batch of stream_query or stream_query_columns."""
+    if isinstance(batch, dict):
+        return len(next(iter(batch.values()), ()))
+    if hasattr(batch, "num_rows"):
+        return batch.num_rows
+    return len(batch)
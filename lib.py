@@ -1,19 +1,36 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from datetime import timedelta
+from functools import partial
 from pathlib import Path
 from pprint import pformat
 from string import Template
 import itertools
 import json
+import re
+import time
 import typing
+from classes.dq_compiled_sql_store import DqCompiledSqlStore
 from classes.dq_config_type import DqConfigType
+from classes.dq_configs_cache import DqConfigsAccumulator
 from classes.dq_configs_cache import DqConfigsCache
+from classes.dq_configs_cache import validate_configs
+from classes.dq_entity import get_snapshot_partition_fields
+from classes.dq_execution_scheduler import DqExecutionJob
+from classes.dq_execution_scheduler import DqExecutionStatement
 from classes.dq_rule import DqRule
 from classes.dq_rule_binding import DqRuleBinding
 from logger import getlogger
 from utils import assert_not_none_or_empty
 from utils import load_jinja_template
+from utils import get_templates_hashsum
+from utils import get_yaml_config_node
 from utils import load_yaml
+from utils import load_yaml_file
+from utils import load_yaml_string
 from utils import sha256_digest
 from integration.redshift.redshiftclient import RedshiftClient
 
@@ -21,31 +38,88 @@ from integration.redshift.redshiftclient import RedshiftClient
 logger = getlogger()
 
 
-def load_configs(configs_path,configs_type: DqConfigType):
-    logger.info(f"configs_path-{configs_path},configs_type-{configs_type}")
+CONFIG_TYPES = (
+    DqConfigType.ENTITIES,
+    DqConfigType.ROW_FILTERS,
+    DqConfigType.REFERENCE_COLUMNS,
+    DqConfigType.RULE_DIMENSIONS,
+    DqConfigType.RULES,
+    DqConfigType.RULE_BINDINGS,
+)
+# Per-run values are rendered as string.Template placeholders so that the
+# compiled SQL can be reused and only these values bound at run time.
+RUN_TIME_SQL_PLACEHOLDERS = {
+    "high_watermark_value": "${high_watermark_value}",
+    "current_timestamp_value": "${current_timestamp_value}",
+    "shared_entity_data_table": "${shared_entity_data_table}",
+    "snapshot_start_value": "${snapshot_start_value}",
+    "snapshot_end_value": "${snapshot_end_value}",
+}
+# Run-time values that are sent as bind parameters rather than written into
+# the SQL text when parameterized_sql is set. tgt_tbl_snapshot_value is the
+# $-placeholder custom SQL rules use for the --snapshot_date value.
+SQL_PARAMETER_NAMES = (
+    "high_watermark_value",
+    "current_timestamp_value",
+    "tgt_tbl_snapshot_value",
+    "snapshot_start_value",
+    "snapshot_end_value",
+)
+# Rule binding arguments naming columns of the rule binding's entity, which
+# the data CTE has to project when prune_data_columns is set.
+RE_DATA_COLUMN_ARGUMENT = re.compile(r"^(p_column_name|tgt_tbl_\w*column)$")
+RE_SQL_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+RE_SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'|`[^`]*`")
+RE_SQL_TOKEN = re.compile(
+    r"\$\{?\w+\}?"
+    r"|[A-Za-z_]\w*(?:\.(?:[A-Za-z_]\w*|\$\{?\w+\}?|\*))*"
+    r"|::|[0-9][\w.]*|\S"
+)
+# --snapshot_date values: a day as YYYY-MM-DD or YYYYMMDD, a month as
+# YYYY-MM or YYYYMM.
+RE_SNAPSHOT_DAY = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})")
+RE_SNAPSHOT_MONTH = re.compile(r"(\d{4})-?(\d{2})")
+# (table_id, rule_binding_id) pairs per high watermark query, two bind
+# parameters each.
+HIGH_WATERMARK_BATCH_SIZE = 1000
+SQL_KEYWORDS = {
+    "all", "and", "as", "asc", "between", "by", "case", "cross", "desc",
+    "distinct", "else", "end", "exists", "false", "from", "full", "group",
+    "having", "ilike", "in", "inner", "is", "join", "left", "like", "limit",
+    "not", "null", "on", "or", "order", "outer", "over", "partition", "right",
+    "select", "similar", "then", "to", "true", "union", "using", "when",
+    "where", "with",
+}
+
+
+def get_yaml_files(configs_path: Path) -> list[Path]:
     if configs_path.is_file():
-        yaml_files = [configs_path]
-    else:
-        other_configs = (configs_path/"..").resolve()
-        #rules = (configs_path / ".." / "rules").resolve()
-        #rules = (configs_path / ".." / "rules").resolve()
-        #rules = (configs_path / ".." / "rules").resolve()
-        #logger.info(f"configs_path is not file-{entities},{rules}")
-        logger.info(f"configs_path is not file-{other_configs}")
-        yaml_files = itertools.chain(
-            #configs_path.glob("**/*.yaml"), configs_path.glob("**/*.yml"), entities.glob("**/*.yml"), rules.glob("**/*.yml")
-            configs_path.glob("**/*.yaml"), configs_path.glob("**/*.yml"), other_configs.glob("**/*.yml")
-        )
-    #logger.info(f"yaml_files-{list(yaml_files)}")
-    all_configs = {}
+        return [configs_path]
+    other_configs = (configs_path/"..").resolve()
+    logger.info(f"configs_path is not file-{other_configs}")
+    yaml_files = itertools.chain(
+        configs_path.glob("**/*.yaml"), configs_path.glob("**/*.yml"), other_configs.glob("**/*.yml")
+    )
+    # configs_path is nested under other_configs, so skip files already seen
+    unique_yaml_files = []
+    seen_files = set()
     for file in yaml_files:
-        logger.info("Looping thru config files")
+        resolved_file = file.resolve()
+        if resolved_file in seen_files:
+            continue
+        seen_files.add(resolved_file)
+        unique_yaml_files.append(file)
+    return unique_yaml_files
+
+
+def load_configs(configs_path,configs_type: DqConfigType):
+    logger.info(f"configs_path-{configs_path},configs_type-{configs_type}")
+    accumulator = DqConfigsAccumulator(configs_type)
+    for file in get_yaml_files(configs_path):
         config = load_yaml(file, configs_type.value)
         logger.info(f"file:{file}\nconfig:{config}")
-        if not config:
-            continue
-        print(f"config={config}")
-        all_configs = DqConfigsCache.update_config(configs_type, all_configs, config)
+        accumulator.add(config, file)
+    all_configs = accumulator.configs
     #
     if configs_type.is_required():
         assert_not_none_or_empty(
@@ -56,6 +130,136 @@ def load_configs(configs_path,configs_type: DqConfigType):
     return all_configs
 
 
+def split_yaml_configs(file: Path, yaml_configs: dict) -> dict:
+    file_configs = {}
+    for configs_type in CONFIG_TYPES:
+        if configs_type.value not in yaml_configs:
+            continue
+        config = get_yaml_config_node(file, yaml_configs, configs_type.value)
+        logger.debug(f"file:{file}\n{configs_type.value}:{config}")
+        if config:
+            file_configs[configs_type] = config
+    return file_configs
+
+
+def merge_configs(
+    configs_path: Path, files_configs: typing.Iterable[tuple[Path, dict]]
+) -> dict:
+    accumulators = {
+        configs_type: DqConfigsAccumulator(configs_type) for configs_type in CONFIG_TYPES
+    }
+    for file, file_configs in files_configs:
+        for configs_type, config in file_configs.items():
+            accumulators[configs_type].add(config, file)
+    all_configs = {
+        configs_type: accumulator.configs
+        for configs_type, accumulator in accumulators.items()
+    }
+    for configs_type in CONFIG_TYPES:
+        if configs_type.is_required():
+            assert_not_none_or_empty(
+                all_configs[configs_type],
+                f"Failed to load {configs_type.value} from file path: {configs_path}",
+            )
+    return all_configs
+
+
+def merge_validated_configs(
+    validated_configs: dict, file_validated_configs: dict
+) -> None:
+    # duplicated config IDs must be identical, so the first result wins
+    for configs_type, validated in file_validated_configs.items():
+        configs_type_validated = validated_configs.setdefault(configs_type, {})
+        for config_id, validated_config in validated.items():
+            configs_type_validated.setdefault(config_id, validated_config)
+
+
+def parse_and_validate_yaml_file(
+    file: Path, content: str | None = None, validate: bool = False
+) -> tuple[dict, dict | None]:
+    if content is None:
+        yaml_configs = load_yaml_file(file)
+    else:
+        yaml_configs = load_yaml_string(content)
+    file_configs = split_yaml_configs(file, yaml_configs)
+    if not validate:
+        return file_configs, None
+    file_validated_configs = {
+        configs_type: validate_configs(configs_type.value, config)
+        for configs_type, config in file_configs.items()
+        if configs_type != DqConfigType.RULE_DIMENSIONS
+    }
+    return file_configs, file_validated_configs
+
+
+def parse_yaml_files(
+    files: list[Path],
+    contents: list[str | None] | None = None,
+    num_processes: int = 1,
+    validate: bool = False,
+) -> typing.Iterator[tuple[dict, dict | None]]:
+    """Yield (file_configs, validated_configs) for each file, in file order.
+
+    With num_processes > 1 the files are parsed (and optionally validated)
+    in a process pool. Results are still yielded in file order so merging
+    them raises exactly the same duplicate-ID errors as the serial path.
+    """
+    if contents is None:
+        contents = [None] * len(files)
+    if num_processes > 1 and len(files) > 1:
+        logger.info(f"Parsing {len(files)} config files with {num_processes} processes")
+        with ProcessPoolExecutor(max_workers=num_processes) as executor:
+            yield from executor.map(
+                partial(parse_and_validate_yaml_file, validate=validate),
+                files,
+                contents,
+                chunksize=max(1, len(files) // (num_processes * 4)),
+            )
+    else:
+        for file, content in zip(files, contents):
+            yield parse_and_validate_yaml_file(file, content, validate=validate)
+
+
+def load_all_configs(configs_path: Path, num_processes: int = 1) -> dict:
+    """Parse every YAML file once and route each top-level node to its collection."""
+    logger.info(f"Loading all config types from configs_path-{configs_path}")
+    yaml_files = get_yaml_files(configs_path)
+    return merge_configs(
+        configs_path,
+        (
+            (file, file_configs)
+            for file, (file_configs, _) in zip(
+                yaml_files, parse_yaml_files(yaml_files, num_processes=num_processes)
+            )
+        ),
+    )
+
+
+def load_and_validate_all_configs(
+    configs_path: Path, num_processes: int = 1
+) -> tuple[dict, dict | None]:
+    """Like load_all_configs, but also validates configs in the worker processes.
+
+    Returns the merged configs and, when num_processes > 1, the validation
+    results to pass to the DqConfigsCache.load_all_*_collection methods.
+    """
+    if num_processes <= 1:
+        return load_all_configs(configs_path), None
+    validated_configs: dict = {}
+
+    def iter_files_configs() -> typing.Iterator[tuple[Path, dict]]:
+        yaml_files = get_yaml_files(configs_path)
+        for file, (file_configs, file_validated_configs) in zip(
+            yaml_files,
+            parse_yaml_files(yaml_files, num_processes=num_processes, validate=True),
+        ):
+            merge_validated_configs(validated_configs, file_validated_configs)
+            yield file, file_configs
+
+    all_configs = merge_configs(configs_path, iter_files_configs())
+    return all_configs, validated_configs
+
+
 def load_rule_bindings_config(configs_path: Path) -> dict:
     logger.info("Inside load_rule_bindings_config")
     return load_configs(configs_path, DqConfigType.RULE_BINDINGS)
@@ -81,28 +285,311 @@ def load_reference_columns_config(configs_path: Path) -> dict:
     return load_configs(configs_path, DqConfigType.REFERENCE_COLUMNS)
 
 
-def prepare_configs_cache(configs_path: Path) -> DqConfigsCache:
-    configs_cache = DqConfigsCache()
-    entities_collection = load_entities_config(configs_path)
-    configs_cache.load_all_entities_collection(entities_collection)
-    row_filters_collection = load_row_filters_config(configs_path)
-    configs_cache.load_all_row_filters_collection(row_filters_collection)
-    reference_columns_collection = load_reference_columns_config(configs_path)
-    configs_cache.load_all_reference_columns_collection(reference_columns_collection)
-    rule_dimensions_collection = load_rule_dimensions_config(configs_path)
+def prepare_configs_cache(
+    configs_path: Path,
+    all_configs: dict | None = None,
+    num_processes: int = 1,
+    sqlite3_db_name: str | None = None,
+) -> DqConfigsCache:
+    validated_configs: dict = {}
+    if all_configs is None:
+        all_configs, validated_configs = load_and_validate_all_configs(
+            configs_path, num_processes
+        )
+        validated_configs = validated_configs or {}
+    configs_cache = DqConfigsCache(sqlite3_db_name, recreate=True)
+    entities_collection = all_configs[DqConfigType.ENTITIES]
+    configs_cache.load_all_entities_collection(
+        entities_collection, validated_configs.get(DqConfigType.ENTITIES)
+    )
+    row_filters_collection = all_configs[DqConfigType.ROW_FILTERS]
+    configs_cache.load_all_row_filters_collection(
+        row_filters_collection, validated_configs.get(DqConfigType.ROW_FILTERS)
+    )
+    reference_columns_collection = all_configs[DqConfigType.REFERENCE_COLUMNS]
+    configs_cache.load_all_reference_columns_collection(
+        reference_columns_collection,
+        validated_configs.get(DqConfigType.REFERENCE_COLUMNS),
+    )
+    rule_dimensions_collection = all_configs[DqConfigType.RULE_DIMENSIONS]
     configs_cache.load_all_rule_dimensions_collection(rule_dimensions_collection)
-    rules_collection = load_rules_config(configs_path)
+    rules_collection = all_configs[DqConfigType.RULES]
 
     # validate rules against dimensions
     for rule_id, rule in rules_collection.items():
         DqRule.validate(rule_id, rule, rule_dimensions_collection)
 
-    configs_cache.load_all_rules_collection(rules_collection)
-    rule_binding_collection = load_rule_bindings_config(configs_path)
-    configs_cache.load_all_rule_bindings_collection(rule_binding_collection)
+    configs_cache.load_all_rules_collection(
+        rules_collection, validated_configs.get(DqConfigType.RULES)
+    )
+    rule_binding_collection = all_configs[DqConfigType.RULE_BINDINGS]
+    configs_cache.load_all_rule_bindings_collection(
+        rule_binding_collection, validated_configs.get(DqConfigType.RULE_BINDINGS)
+    )
     return configs_cache
 
 
+def prepare_incremental_configs_cache(
+    configs_path: Path, sqlite3_db_name: str | None = None, num_processes: int = 1
+) -> tuple[DqConfigsCache, dict]:
+    """Sync the persistent configs cache with the YAML files under configs_path.
+
+    Only files whose content hash changed since the previous run are parsed,
+    and only the config IDs they define (or used to define) are validated
+    and upserted. Returns the cache and the merged config collections.
+    """
+    configs_cache = DqConfigsCache(sqlite3_db_name)
+    known_files = configs_cache.get_config_files()
+    config_sources = {
+        path: {DqConfigType(configs_type): config for configs_type, config in file_configs.items()}
+        for path, file_configs in configs_cache.get_config_sources().items()
+    }
+    changed_ids = {configs_type: set() for configs_type in CONFIG_TYPES}
+    file_records = []
+    changed_files = []
+    changed_contents = []
+    changed_config_sources = {}
+    validated_configs: dict = {}
+    yaml_files = get_yaml_files(configs_path)
+    for file in yaml_files:
+        path = str(file.resolve())
+        stat = file.stat()
+        known_file = known_files.pop(path, None)
+        if (
+            known_file
+            and known_file["mtime_ns"] == stat.st_mtime_ns
+            and known_file["size"] == stat.st_size
+        ):
+            continue
+        content = file.read_text()
+        file_record = {
+            "path": path,
+            "sha256": sha256_digest(content),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        file_records.append(file_record)
+        if known_file and known_file["sha256"] == file_record["sha256"]:
+            continue
+        logger.info(f"Config file changed since last run: {path}")
+        changed_files.append(file)
+        changed_contents.append(content)
+    for file, (file_configs, file_validated_configs) in zip(
+        changed_files,
+        parse_yaml_files(
+            changed_files,
+            changed_contents,
+            num_processes=num_processes,
+            validate=num_processes > 1,
+        ),
+    ):
+        path = str(file.resolve())
+        if file_validated_configs:
+            merge_validated_configs(validated_configs, file_validated_configs)
+        mark_changed_config_ids(changed_ids, config_sources.get(path, {}))
+        mark_changed_config_ids(changed_ids, file_configs)
+        config_sources[path] = file_configs
+        changed_config_sources[path] = {
+            configs_type.value: config for configs_type, config in file_configs.items()
+        }
+    deleted_paths = list(known_files.keys())
+    for path in deleted_paths:
+        logger.info(f"Config file removed since last run: {path}")
+        mark_changed_config_ids(changed_ids, config_sources.pop(path, {}))
+    all_configs = merge_configs(
+        configs_path,
+        (
+            (file, config_sources.get(str(file.resolve()), {}))
+            for file in yaml_files
+        ),
+    )
+    if any(changed_ids.values()):
+        load_changed_configs(configs_cache, all_configs, changed_ids, validated_configs)
+    else:
+        logger.info("No config changes detected, reusing persisted configs cache.")
+    # Only record the new file state once every changed config validated,
+    # so that a failed run re-processes the same files next time.
+    configs_cache.save_config_files(file_records, changed_config_sources, deleted_paths)
+    return configs_cache, all_configs
+
+
+def mark_changed_config_ids(changed_ids: dict, file_configs: dict) -> None:
+    for configs_type, config in file_configs.items():
+        changed_ids[configs_type].update(config)
+
+
+def load_changed_configs(
+    configs_cache: DqConfigsCache,
+    all_configs: dict,
+    changed_ids: dict,
+    validated_configs: dict | None = None,
+) -> None:
+    validated_configs = validated_configs or {}
+
+    def get_changed_collection(configs_type: DqConfigType) -> dict:
+        collection = all_configs[configs_type]
+        config_ids = changed_ids[configs_type]
+        # upserts only touch the supplied columns, so drop stale rows first
+        configs_cache.delete_configs(configs_type.value, config_ids)
+        # keep the collection order so errors surface as in a full load
+        return {
+            config_id: config
+            for config_id, config in collection.items()
+            if config_id in config_ids
+        }
+
+    configs_cache.load_all_entities_collection(
+        get_changed_collection(DqConfigType.ENTITIES),
+        validated_configs.get(DqConfigType.ENTITIES),
+    )
+    configs_cache.load_all_row_filters_collection(
+        get_changed_collection(DqConfigType.ROW_FILTERS),
+        validated_configs.get(DqConfigType.ROW_FILTERS),
+    )
+    configs_cache.load_all_reference_columns_collection(
+        get_changed_collection(DqConfigType.REFERENCE_COLUMNS),
+        validated_configs.get(DqConfigType.REFERENCE_COLUMNS),
+    )
+    rule_dimensions_collection = all_configs[DqConfigType.RULE_DIMENSIONS]
+    if changed_ids[DqConfigType.RULE_DIMENSIONS]:
+        configs_cache.delete_configs(
+            DqConfigType.RULE_DIMENSIONS.value,
+            changed_ids[DqConfigType.RULE_DIMENSIONS],
+            pk="rule_dimension",
+        )
+        configs_cache.load_all_rule_dimensions_collection(rule_dimensions_collection)
+        # every rule has to be re-validated against the new dimensions
+        changed_ids[DqConfigType.RULES].update(all_configs[DqConfigType.RULES])
+    rules_collection = get_changed_collection(DqConfigType.RULES)
+    for rule_id, rule in rules_collection.items():
+        DqRule.validate(rule_id, rule, rule_dimensions_collection)
+    configs_cache.load_all_rules_collection(
+        rules_collection, validated_configs.get(DqConfigType.RULES)
+    )
+    configs_cache.load_all_rule_bindings_collection(
+        get_changed_collection(DqConfigType.RULE_BINDINGS),
+        validated_configs.get(DqConfigType.RULE_BINDINGS),
+    )
+
+
+def get_rule_binding_references(rule_binding_configs: dict) -> dict:
+    """Config IDs referenced by a raw rule binding config, keyed by config type."""
+    references = {
+        DqConfigType.ENTITIES: set(),
+        DqConfigType.RULES: set(),
+        DqConfigType.ROW_FILTERS: set(),
+        DqConfigType.REFERENCE_COLUMNS: set(),
+    }
+    for configs_type, key in (
+        (DqConfigType.ENTITIES, "entity_id"),
+        (DqConfigType.ROW_FILTERS, "row_filter_id"),
+        (DqConfigType.REFERENCE_COLUMNS, "reference_columns_id"),
+    ):
+        config_id = rule_binding_configs.get(key)
+        if config_id:
+            references[configs_type].add(str(config_id).upper())
+    rule_ids = rule_binding_configs.get("rule_ids")
+    if type(rule_ids) == list:
+        for rule in rule_ids:
+            if type(rule) == dict and rule:
+                rule = next(iter(rule))
+            if rule:
+                references[DqConfigType.RULES].add(str(rule).upper())
+    return references
+
+
+def prepare_lazy_configs_cache(
+    configs_path: Path, rule_binding_ids: list[str], num_processes: int = 1
+) -> tuple[DqConfigsCache, dict]:
+    """Load only the configs reachable from rule_binding_ids into an in-memory cache.
+
+    Files are pre-scanned as text and only parsed when they mention an ID
+    that is still unresolved (IDs are matched case-insensitively, like the
+    upper-cased config keys). The requested rule bindings are parsed first,
+    then the entities, rules, row filters and reference columns they
+    reference, so nothing else is parsed, validated or loaded.
+    Duplicate-ID checks only cover the files that were parsed.
+    """
+    rule_binding_ids = [rule_binding_id.upper() for rule_binding_id in rule_binding_ids]
+    yaml_files = get_yaml_files(configs_path)
+    contents = {file: file.read_text() for file in yaml_files}
+    searchable_contents = {file: content.lower() for file, content in contents.items()}
+    parsed_files: dict = {}
+    # rules are validated against rule_dimensions, so always load them
+    pending_ids = {DqConfigType.RULE_DIMENSIONS.value, *rule_binding_ids}
+    searched_ids: set = set()
+    referenced_ids = {configs_type: set() for configs_type in CONFIG_TYPES}
+    referenced_ids[DqConfigType.RULE_BINDINGS].update(rule_binding_ids)
+    while pending_ids:
+        searched_ids.update(pending_ids)
+        pending_tokens = [config_id.lower() for config_id in pending_ids]
+        new_files = [
+            file
+            for file in yaml_files
+            if file not in parsed_files
+            and any(token in searchable_contents[file] for token in pending_tokens)
+        ]
+        logger.debug(f"Lazily parsing config files for {sorted(pending_ids)}: {new_files}")
+        for file, (file_configs, _) in zip(
+            new_files,
+            parse_yaml_files(
+                new_files,
+                [contents[file] for file in new_files],
+                num_processes=num_processes,
+            ),
+        ):
+            parsed_files[file] = file_configs
+        defined_ids = {configs_type: set() for configs_type in CONFIG_TYPES}
+        rule_bindings = {}
+        for file_configs in parsed_files.values():
+            mark_changed_config_ids(defined_ids, file_configs)
+            rule_bindings.update(file_configs.get(DqConfigType.RULE_BINDINGS, {}))
+        for rule_binding_id in rule_binding_ids:
+            if rule_binding_id in rule_bindings:
+                for configs_type, config_ids in get_rule_binding_references(
+                    rule_bindings[rule_binding_id]
+                ).items():
+                    referenced_ids[configs_type].update(config_ids)
+        pending_ids = {
+            config_id
+            for configs_type, config_ids in referenced_ids.items()
+            for config_id in config_ids - defined_ids[configs_type]
+        } - searched_ids
+    for rule_binding_id in rule_binding_ids:
+        assert_not_none_or_empty(
+            rule_binding_id in rule_bindings,
+            f"Target Rule Binding Id: {rule_binding_id} not found "
+            f"in config path {configs_path.absolute()}.",
+        )
+    all_configs = merge_configs(
+        configs_path,
+        ((file, parsed_files[file]) for file in yaml_files if file in parsed_files),
+    )
+    lazy_configs = {
+        configs_type: {
+            config_id: config
+            for config_id, config in all_configs[configs_type].items()
+            if config_id in referenced_ids[configs_type]
+        }
+        for configs_type in CONFIG_TYPES
+        if configs_type != DqConfigType.RULE_DIMENSIONS
+    }
+    lazy_configs[DqConfigType.RULE_DIMENSIONS] = all_configs[
+        DqConfigType.RULE_DIMENSIONS
+    ]
+    logger.info(
+        f"Lazily loaded {len(parsed_files)} of {len(yaml_files)} config files: "
+        + ", ".join(
+            f"{len(lazy_configs[configs_type])} {configs_type.value}"
+            for configs_type in CONFIG_TYPES
+        )
+    )
+    configs_cache = prepare_configs_cache(
+        configs_path, all_configs=lazy_configs, sqlite3_db_name=":memory:"
+    )
+    return configs_cache, lazy_configs
+
+
 def create_rule_binding_view_model(
     rule_binding_id: str,
     rule_binding_configs: dict,
@@ -115,15 +602,19 @@ def create_rule_binding_view_model(
     debug: bool = False,
     progress_watermark: bool = True,
     high_watermark_filter_exists: bool = False,
+    fuse_attribute_rules: bool = False,
+    share_entity_scan: bool = False,
+    parameterized_sql: bool = False,
+    materialize_validation_results: bool = False,
+    prune_data_columns: bool = False,
+    sampling: dict | None = None,
+    snapshot_date: str | None = None,
+    snapshot_end_date: str | None = None,
+    aggregate_summary: bool = False,
+    failed_records_sample_size: int = 0,
+    resolved_rule_binding_configs: dict | None = None,
+    compiled_sql_store: DqCompiledSqlStore | None = None,
 ) -> dict:
-    template = load_jinja_template(
-        template_path=Path("macros", "create_rule_binding_view.sql")
-    )
-    logger.info(f"template:{template}\nredshift_client:{redshift_client}")
-    failed_records_template = load_jinja_template(
-        template_path=Path("macros", "failed_records_query.sql")
-    )
-    logger.info(f"failed_records_template:{failed_records_template}")
     configs = prepare_configs_from_rule_binding_id(
         rule_binding_id=rule_binding_id,
         rule_binding_configs=rule_binding_configs,
@@ -134,26 +625,648 @@ def create_rule_binding_view_model(
         progress_watermark=progress_watermark,
         dq_summary_table_exists=dq_summary_table_exists,
         high_watermark_filter_exists=high_watermark_filter_exists,
-        redshift_client=redshift_client
+        fuse_attribute_rules=fuse_attribute_rules,
+        share_entity_scan=share_entity_scan,
+        parameterized_sql=parameterized_sql,
+        materialize_validation_results=materialize_validation_results,
+        prune_data_columns=prune_data_columns,
+        sampling=sampling,
+        snapshot_date=snapshot_date,
+        snapshot_end_date=snapshot_end_date,
+        aggregate_summary=aggregate_summary,
+        failed_records_sample_size=failed_records_sample_size,
+        redshift_client=redshift_client,
+        resolved_rule_binding_configs=resolved_rule_binding_configs,
     )
-    logger.info(f"configs:\n{pformat(configs)}")
-    logger.info(f"config_keys:\n{pformat(configs.get('configs').keys())}")
-    rule_ids=configs.get('configs').get('rule_ids')
-    logger.info(f"rule_ids:\n{pformat(rule_ids)}")
-    for rule_id in rule_ids:
-        logger.info(f"columns:\n{pformat(rule_id)}")
+    compiled_sql_key, compiled_sql = get_stored_compiled_sql(
+        rule_binding_id, configs, compiled_sql_store
+    )
+    render_seconds = 0.0
+    if not compiled_sql:
+        compiled_sql, render_seconds = timed_render_rule_binding_sql(configs)
+        logger.debug(
+            f"Rendered SQL for rule binding {rule_binding_id} "
+            f"in {render_seconds * 1000:.2f} ms"
+        )
+        if compiled_sql_store:
+            compiled_sql_store.put_compiled_sql(
+                rule_binding_id=rule_binding_id,
+                compiled_sql_key=compiled_sql_key,
+                **compiled_sql,
+            )
+    return bind_rule_binding_sql(configs, compiled_sql, render_seconds, debug)
 
-    sql_string = template.render(configs)
-    failed_records_sql_string = failed_records_template.render(configs)
-    configs.update({"generated_sql_string": sql_string})
+
+def create_rule_binding_view_models(
+    rule_binding_ids: list[str],
+    all_rule_bindings: dict,
+    dq_summary_table_name: str,
+    environment: str,
+    configs_cache: DqConfigsCache,
+    redshift_client: RedshiftClient,
+    resolved_rule_bindings: dict,
+    dq_summary_table_exists: bool = False,
+    metadata: dict | None = None,
+    debug: bool = False,
+    progress_watermark: bool = True,
+    high_watermark_filter_exists: bool = False,
+    fuse_attribute_rules: bool = False,
+    share_entity_scan: bool = False,
+    parameterized_sql: bool = False,
+    materialize_validation_results: bool = False,
+    prune_data_columns: bool = False,
+    sampling: dict | None = None,
+    snapshot_date: str | None = None,
+    snapshot_end_date: str | None = None,
+    aggregate_summary: bool = False,
+    failed_records_sample_size: int = 0,
+    compiled_sql_store: DqCompiledSqlStore | None = None,
+    num_threads: int = 1,
+) -> dict[str, dict | Exception]:
+    """Concurrent create_rule_binding_view_model over many rule bindings.
+
+    The high watermarks of all incremental rule bindings are looked up
+    together first, see get_high_watermark_values. Configs are then prepared
+    in a thread pool and templates rendered in a process pool, both of
+    num_threads workers. Compiled SQL store access stays on the calling
+    thread. Returns the configs for every rule binding in rule_binding_ids
+    order, or the exception raised while preparing it.
+    """
+    results: dict[str, dict | Exception] = {}
+    table_rule_binding_ids = []
+    for rule_binding_id in rule_binding_ids:
+        table_id = get_high_watermark_table_id(resolved_rule_bindings[rule_binding_id])
+        if table_id:
+            table_rule_binding_ids.append((table_id, rule_binding_id))
+    high_watermark_values: dict[str, dict] = {}
+    high_watermark_error: Exception | None = None
+    if table_rule_binding_ids:
+        try:
+            high_watermark_values = get_high_watermark_values(
+                table_rule_binding_ids=table_rule_binding_ids,
+                dq_summary_table_name=dq_summary_table_name,
+                redshift_client=redshift_client,
+            )
+        except Exception as error:
+            logger.error(f"Failed to look up high watermarks: {error}")
+            high_watermark_error = error
+    incremental_rule_binding_ids = {
+        rule_binding_id for _, rule_binding_id in table_rule_binding_ids
+    }
+
+    def prepare_configs(rule_binding_id: str) -> dict | Exception:
+        if high_watermark_error and rule_binding_id in incremental_rule_binding_ids:
+            return high_watermark_error
+        try:
+            return prepare_configs_from_rule_binding_id(
+                rule_binding_id=rule_binding_id,
+                rule_binding_configs=all_rule_bindings[rule_binding_id],
+                dq_summary_table_name=dq_summary_table_name,
+                environment=environment,
+                configs_cache=configs_cache,
+                metadata=dict(metadata) if metadata else None,
+                progress_watermark=progress_watermark,
+                dq_summary_table_exists=dq_summary_table_exists,
+                high_watermark_filter_exists=high_watermark_filter_exists,
+                fuse_attribute_rules=fuse_attribute_rules,
+                share_entity_scan=share_entity_scan,
+                parameterized_sql=parameterized_sql,
+                materialize_validation_results=materialize_validation_results,
+                prune_data_columns=prune_data_columns,
+                sampling=sampling,
+                snapshot_date=snapshot_date,
+                snapshot_end_date=snapshot_end_date,
+                aggregate_summary=aggregate_summary,
+                failed_records_sample_size=failed_records_sample_size,
+                redshift_client=redshift_client,
+                resolved_rule_binding_configs=resolved_rule_bindings[rule_binding_id],
+                high_watermark_values=high_watermark_values,
+            )
+        except Exception as error:
+            logger.error(
+                f"Failed to prepare configs for rule binding {rule_binding_id}: {error}"
+            )
+            return error
+
+    if num_threads > 1:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            prepared_configs = list(executor.map(prepare_configs, rule_binding_ids))
+    else:
+        prepared_configs = [prepare_configs(rb_id) for rb_id in rule_binding_ids]
+    pending_renders = {}
+    compiled_sqls = {}
+    for rule_binding_id, configs in zip(rule_binding_ids, prepared_configs):
+        results[rule_binding_id] = configs
+        if isinstance(configs, Exception):
+            continue
+        compiled_sqls[rule_binding_id] = get_stored_compiled_sql(
+            rule_binding_id, configs, compiled_sql_store
+        )
+        if not compiled_sqls[rule_binding_id][1]:
+            pending_renders[rule_binding_id] = configs
+    logger.info(
+        f"Rendering SQL for {len(pending_renders)} of {len(rule_binding_ids)} "
+        f"rule bindings with {num_threads} processes."
+    )
+    if num_threads > 1 and len(pending_renders) > 1:
+        with ProcessPoolExecutor(max_workers=num_threads) as executor:
+            render_futures = {
+                rule_binding_id: executor.submit(timed_render_rule_binding_sql, configs)
+                for rule_binding_id, configs in pending_renders.items()
+            }
+            rendered = {}
+            for rule_binding_id, future in render_futures.items():
+                try:
+                    rendered[rule_binding_id] = future.result()
+                except Exception as error:
+                    rendered[rule_binding_id] = error
+    else:
+        rendered = {}
+        for rule_binding_id, configs in pending_renders.items():
+            try:
+                rendered[rule_binding_id] = timed_render_rule_binding_sql(configs)
+            except Exception as error:
+                rendered[rule_binding_id] = error
+    for rule_binding_id in rule_binding_ids:
+        configs = results[rule_binding_id]
+        if isinstance(configs, Exception):
+            continue
+        compiled_sql_key, compiled_sql = compiled_sqls[rule_binding_id]
+        render_seconds = 0.0
+        if rule_binding_id in rendered:
+            if isinstance(rendered[rule_binding_id], Exception):
+                logger.error(
+                    f"Failed to render SQL for rule binding {rule_binding_id}: "
+                    f"{rendered[rule_binding_id]}"
+                )
+                results[rule_binding_id] = rendered[rule_binding_id]
+                continue
+            compiled_sql, render_seconds = rendered[rule_binding_id]
+            if compiled_sql_store:
+                compiled_sql_store.put_compiled_sql(
+                    rule_binding_id=rule_binding_id,
+                    compiled_sql_key=compiled_sql_key,
+                    **compiled_sql,
+                )
+        results[rule_binding_id] = bind_rule_binding_sql(
+            configs, compiled_sql, render_seconds, debug
+        )
+    return results
+
+
+def get_stored_compiled_sql(
+    rule_binding_id: str,
+    configs: dict,
+    compiled_sql_store: DqCompiledSqlStore | None = None,
+) -> tuple[str, dict | None]:
+    compiled_sql_key = get_compiled_sql_key(configs)
+    logger.debug(f"Compiled SQL key for {rule_binding_id}: {compiled_sql_key}")
+    compiled_sql = None
+    if compiled_sql_store:
+        compiled_sql = compiled_sql_store.get_compiled_sql(
+            rule_binding_id, compiled_sql_key
+        )
+    return compiled_sql_key, compiled_sql
+
+
+def bind_rule_binding_sql(
+    configs: dict, compiled_sql: dict, render_seconds: float, debug: bool = False
+) -> dict:
+    if configs.get("share_entity_scan"):
+        configs.update(render_entity_data_scan_sql(configs))
+    run_time_values = {
+        key: configs.get(key, "") for key in RUN_TIME_SQL_PLACEHOLDERS
+    }
+    if configs.get("parameterized_sql"):
+        parameter_names = get_sql_parameter_names(
+            compiled_sql.values(),
+            [key for key in SQL_PARAMETER_NAMES if key in run_time_values],
+        )
+        missing_parameter_names = [
+            key for key in parameter_names if configs.get(key) is None
+        ]
+        if missing_parameter_names:
+            raise ValueError(
+                f"Rule binding {configs['configs']['rule_binding_id']} SQL uses "
+                f"{missing_parameter_names} but no value is set for them."
+            )
+        sql_parameters = {key: run_time_values.pop(key) for key in parameter_names}
+        compiled_sql = {
+            sql_string_key: parameterize_sql_string(sql_string, sql_parameters)
+            for sql_string_key, sql_string in compiled_sql.items()
+        }
+        configs.update({"sql_parameters": sql_parameters})
+    for sql_string_key, sql_string in compiled_sql.items():
+        configs.update(
+            {sql_string_key: Template(sql_string).safe_substitute(run_time_values)}
+        )
     #logger.info(f"after input_param update:{Template(sql_string).safe_substitute({'tgt_snapshot_value':'202207'})}")
-    configs.update({"failed_records_sql_string": failed_records_sql_string})
-    print(f"failed_records_sql_string:{failed_records_sql_string}")
+    configs.update({"render_seconds": render_seconds})
+    print(f"failed_records_sql_string:{configs['failed_records_sql_string']}")
     if debug:
         logger.info(pformat(configs))
     return configs
 
 
+def get_quoted_sql_parameter_regex(parameter_names: list[str]) -> re.Pattern:
+    return re.compile(
+        r"'\$\{?(" + "|".join(map(re.escape, parameter_names)) + r")\}?'"
+    )
+
+
+def get_sql_parameter_names(
+    sql_strings: typing.Iterable[str], parameter_names: list[str]
+) -> list[str]:
+    """The parameter_names whose quoted placeholders appear in sql_strings."""
+    if not parameter_names:
+        return []
+    quoted_sql_parameter = get_quoted_sql_parameter_regex(parameter_names)
+    found_names = {
+        match.group(1)
+        for sql_string in sql_strings
+        for match in quoted_sql_parameter.finditer(sql_string)
+    }
+    return [name for name in parameter_names if name in found_names]
+
+
+def parameterize_sql_string(
+    sql_string: str, parameter_names: typing.Iterable[str]
+) -> str:
+    """Replace the quoted run-time placeholders with :name bind parameters.
+
+    Only placeholders in parameter_names are replaced, since a :name without
+    a bound value fails the query. The SQL text then no longer changes
+    between runs, only the values bound to it do.
+    """
+    parameter_names = list(parameter_names)
+    if not parameter_names:
+        return sql_string
+    return get_quoted_sql_parameter_regex(parameter_names).sub(r":\1", sql_string)
+
+
+def get_compiled_sql_key(configs: dict) -> str:
+    """Hash of everything the rendered SQL depends on except the run-time values.
+
+    The resolved rule binding is covered by configs_hashsum, the templates by
+    their hashsum and the remaining render arguments are hashed as they are.
+    """
+    render_arguments = {
+        key: value
+        for key, value in configs.items()
+        if key != "configs" and key not in RUN_TIME_SQL_PLACEHOLDERS
+    }
+    render_arguments["templates_hashsum"] = get_templates_hashsum()
+    return sha256_digest(json.dumps(render_arguments, sort_keys=True, default=str))
+
+
+def render_rule_binding_sql(configs: dict) -> dict:
+    template = load_jinja_template(
+        template_path=Path("macros", "create_rule_binding_view.sql")
+    )
+    failed_records_template = load_jinja_template(
+        template_path=Path("macros", "failed_records_query.sql")
+    )
+    render_configs = {**configs, **RUN_TIME_SQL_PLACEHOLDERS}
+    compiled_sql = {
+        "generated_sql_string": template.render(render_configs),
+        "failed_records_sql_string": failed_records_template.render(render_configs),
+    }
+    if configs.get("materialize_validation_results"):
+        compiled_sql["validation_results_sql_string"] = template.render(
+            {**render_configs, "validation_results_only": True}
+        )
+    return compiled_sql
+
+
+def render_entity_data_scan_sql(
+    configs: dict,
+    shared_entity_data_table: str | None = None,
+    entity_data_scan_columns: list[str] | None = None,
+) -> dict:
+    """Temp table holding the rows a rule binding reads from its entity.
+
+    Rule bindings on the same entity with the same incremental window and row
+    filter render the same scan, so the hash of its SELECT * form names the
+    table they share.
+    """
+    template = load_jinja_template(
+        template_path=Path("macros", "create_entity_data_scan.sql")
+    )
+    scan_sql_string = template.render(configs).strip()
+    if not shared_entity_data_table:
+        shared_entity_data_table = (
+            f"dq_entity_data_{sha256_digest(scan_sql_string)[:16]}"
+        )
+    if entity_data_scan_columns:
+        scan_sql_string = template.render(
+            {**configs, "entity_data_scan_columns": entity_data_scan_columns}
+        ).strip()
+    return {
+        "shared_entity_data_table": shared_entity_data_table,
+        "entity_data_scan_sql_string": (
+            f"CREATE TEMP TABLE {shared_entity_data_table} AS\n{scan_sql_string}"
+        ),
+    }
+
+
+def project_entity_data_scans(rule_binding_configs: typing.Iterable[dict]) -> None:
+    """Narrow each shared entity data scan to the columns its rule bindings read.
+
+    A scan projects the union of the data_columns of the rule bindings sharing
+    it, and keeps SELECT * if any of them reads all columns of the entity.
+    """
+    shared_rule_bindings: dict[str, list[dict]] = {}
+    for configs in rule_binding_configs:
+        if configs.get("share_entity_scan"):
+            shared_rule_bindings.setdefault(
+                configs["shared_entity_data_table"], []
+            ).append(configs)
+    for shared_entity_data_table, configs_list in shared_rule_bindings.items():
+        if any(configs.get("data_columns") is None for configs in configs_list):
+            continue
+        entity_data_scan_columns = {}
+        for configs in configs_list:
+            for column in configs["data_columns"]:
+                entity_data_scan_columns.setdefault(column.lower(), column)
+        entity_data_scan = render_entity_data_scan_sql(
+            configs_list[0],
+            shared_entity_data_table=shared_entity_data_table,
+            entity_data_scan_columns=list(entity_data_scan_columns.values()),
+        )
+        for configs in configs_list:
+            configs.update(entity_data_scan)
+
+
+def get_entity_data_scans(rule_binding_configs: typing.Iterable[dict]) -> dict:
+    """Distinct entity data scans keyed by temp table name, in first-use order."""
+    entity_data_scans = {}
+    for configs in rule_binding_configs:
+        if configs.get("share_entity_scan"):
+            entity_data_scans.setdefault(
+                configs["shared_entity_data_table"],
+                configs["entity_data_scan_sql_string"],
+            )
+    return entity_data_scans
+
+
+def get_rule_binding_statements(
+    rule_binding_id: str, configs: dict
+) -> list[DqExecutionStatement]:
+    """Statements running a rule binding, in order, on one session."""
+    sql_string_keys = ["generated_sql_string", "failed_records_sql_string"]
+    if configs.get("materialize_validation_results"):
+        sql_string_keys.insert(0, "validation_results_sql_string")
+    statements = [
+        DqExecutionStatement(
+            rule_binding_id=rule_binding_id,
+            sql_string_key=sql_string_key,
+            sql_string=configs[sql_string_key],
+            parameters=configs.get("sql_parameters"),
+            # Without aggregate_summary the summary has a row per validated
+            # row, and the failed records one per failed row.
+            stream_results=sql_string_key != "validation_results_sql_string",
+        )
+        for sql_string_key in sql_string_keys
+    ]
+    if configs.get("materialize_validation_results"):
+        statements.append(
+            DqExecutionStatement(
+                rule_binding_id=rule_binding_id,
+                sql_string_key="drop_validation_results_sql_string",
+                sql_string=f"DROP TABLE IF EXISTS {configs['validation_results_table']}",
+            )
+        )
+    return statements
+
+
+def get_rule_binding_execution_jobs(
+    rule_binding_configs: dict[str, dict]
+) -> list[DqExecutionJob]:
+    """One job per rule binding, or per shared entity data scan.
+
+    Rule bindings sharing an entity data scan read its session temp table, so
+    they run in one job after the scan, which is dropped once they are done.
+    """
+    jobs: dict[str, DqExecutionJob] = {}
+    entity_data_scan_job_ids = []
+    for rule_binding_id, configs in rule_binding_configs.items():
+        entity_id = configs["configs"]["entity_id"]
+        if not configs.get("share_entity_scan"):
+            jobs[rule_binding_id] = DqExecutionJob(
+                job_id=rule_binding_id,
+                entity_id=entity_id,
+                statements=get_rule_binding_statements(rule_binding_id, configs),
+            )
+            continue
+        shared_entity_data_table = configs["shared_entity_data_table"]
+        if shared_entity_data_table not in jobs:
+            entity_data_scan_job_ids.append(shared_entity_data_table)
+            jobs[shared_entity_data_table] = DqExecutionJob(
+                job_id=shared_entity_data_table,
+                entity_id=entity_id,
+                statements=[
+                    DqExecutionStatement(
+                        rule_binding_id=None,
+                        sql_string_key="entity_data_scan_sql_string",
+                        sql_string=configs["entity_data_scan_sql_string"],
+                    )
+                ],
+            )
+        jobs[shared_entity_data_table].statements.extend(
+            get_rule_binding_statements(rule_binding_id, configs)
+        )
+    for shared_entity_data_table in entity_data_scan_job_ids:
+        jobs[shared_entity_data_table].statements.append(
+            DqExecutionStatement(
+                rule_binding_id=None,
+                sql_string_key="drop_entity_data_scan_sql_string",
+                sql_string=f"DROP TABLE IF EXISTS {shared_entity_data_table}",
+            )
+        )
+    return list(jobs.values())
+
+
+def timed_render_rule_binding_sql(configs: dict) -> tuple[dict, float]:
+    render_start = time.perf_counter()
+    compiled_sql = render_rule_binding_sql(configs)
+    return compiled_sql, time.perf_counter() - render_start
+
+
+def get_sql_placeholder_name(token: str) -> str | None:
+    if token.startswith("$"):
+        return token.strip("${}")
+    return None
+
+
+def get_rule_data_columns(rule_configs: dict) -> set[str] | None:
+    """Columns of data a rule reads, or None if its SQL cannot be analyzed.
+
+    The rule SQL is analyzed before the rule binding arguments are
+    substituted. Data columns are the values of the p_column_name and
+    tgt_tbl_*column arguments and names qualified with data or its alias.
+    Any other bare identifier that is not a keyword, function, alias or
+    table reference could be a data column, as could a wildcard over data
+    or any other argument whose value is an identifier, so these make the
+    rule unanalyzable.
+    """
+    params = rule_configs.get("params") or {}
+    sql_string = params.get("custom_sql_expr") or params.get("custom_sql_statement")
+    if not sql_string:
+        return None
+    arguments = params.get("rule_binding_arguments") or {}
+    argument_columns = {
+        argument: [column.strip() for column in str(value).split(",") if column.strip()]
+        for argument, value in arguments.items()
+    }
+    data_columns = {
+        column
+        for argument, columns in argument_columns.items()
+        if RE_DATA_COLUMN_ARGUMENT.match(argument)
+        for column in columns
+    }
+    tokens = RE_SQL_TOKEN.findall(RE_SQL_STRING_LITERAL.sub("''", sql_string))
+    lowered = [token.lower() for token in tokens]
+    data_names = {"data"}
+    aliases = set()
+    for index, token in enumerate(lowered):
+        previous_token = lowered[index - 1] if index else ""
+        next_token = lowered[index + 1] if index + 1 < len(lowered) else ""
+        if previous_token in ("as", "::"):
+            aliases.add(token)
+        elif next_token == "as" and lowered[index + 2 : index + 3] == ["("]:
+            aliases.add(token)
+        elif previous_token == ")" and token not in SQL_KEYWORDS:
+            aliases.add(token)
+        elif previous_token in ("from", "join") and next_token not in SQL_KEYWORDS:
+            if next_token[:1].isalpha() or next_token[:1] == "_":
+                aliases.add(next_token)
+                if token == "data":
+                    data_names.add(next_token)
+    for index, token in enumerate(lowered):
+        previous_token = lowered[index - 1] if index else ""
+        next_token = lowered[index + 1] if index + 1 < len(lowered) else ""
+        placeholder_name = get_sql_placeholder_name(token)
+        if placeholder_name:
+            if (
+                RE_DATA_COLUMN_ARGUMENT.match(placeholder_name)
+                or previous_token in ("from", "join")
+                or not any(
+                    RE_SQL_IDENTIFIER.fullmatch(column)
+                    for column in argument_columns.get(placeholder_name, [""])
+                )
+            ):
+                continue
+            # Any other argument could name a data column the data CTE
+            # would then not project.
+            return None
+        elif token == "*":
+            if previous_token in ("select", ",", "distinct") and lowered[
+                index + 1 : index + 3
+            ] != ["from", "("]:
+                return None
+        elif "." in token:
+            qualifier, column = tokens[index].split(".", 1)
+            if qualifier.lower() not in data_names or "." in column:
+                continue
+            if column == "*":
+                return None
+            placeholder_name = get_sql_placeholder_name(column)
+            if placeholder_name:
+                data_columns.update(argument_columns.get(placeholder_name, []))
+            else:
+                data_columns.add(column)
+        elif not (token[:1].isalpha() or token[:1] == "_"):
+            continue
+        elif (
+            token in SQL_KEYWORDS
+            or token in aliases
+            or token in data_names
+            or next_token == "("
+            or previous_token in ("from", "join")
+        ):
+            continue
+        else:
+            return None
+    return data_columns
+
+
+def get_data_columns(resolved_rule_binding_configs: dict) -> list[str] | None:
+    """Columns the data CTE of a rule binding must project, or None for all."""
+    data_columns = {}
+    for rule_configs in resolved_rule_binding_configs["rule_configs_dict"].values():
+        rule_data_columns = get_rule_data_columns(rule_configs)
+        if rule_data_columns is None:
+            return None
+        for column in sorted(rule_data_columns):
+            data_columns.setdefault(column.lower(), column)
+    for column in resolved_rule_binding_configs.get("include_reference_columns") or []:
+        data_columns.setdefault(column.lower(), column)
+    incremental_time_filter_column = resolved_rule_binding_configs.get(
+        "incremental_time_filter_column"
+    )
+    if incremental_time_filter_column:
+        data_columns.setdefault(
+            incremental_time_filter_column.lower(), incremental_time_filter_column
+        )
+    partition_fields = (
+        resolved_rule_binding_configs["entity_configs"].get("partition_fields") or []
+    )
+    for field in partition_fields:
+        data_columns.setdefault(field["name"].lower(), field["name"])
+    return list(data_columns.values())
+
+
+def get_snapshot_period(snapshot_date: str, granularity: str) -> tuple[date, date]:
+    """First day and the day after the last day of the snapshots in snapshot_date.
+
+    A month value covers every daily snapshot of the month, and a day value
+    of a MONTHLY partition field is widened to its month.
+    """
+    day_match = RE_SNAPSHOT_DAY.fullmatch(snapshot_date.strip())
+    month_match = RE_SNAPSHOT_MONTH.fullmatch(snapshot_date.strip())
+    try:
+        if day_match and granularity == "DAILY":
+            period_start = date(*map(int, day_match.groups()))
+            return period_start, period_start + timedelta(days=1)
+        if day_match:
+            period_start = date(*map(int, day_match.groups()[:2]), 1)
+        elif month_match:
+            period_start = date(*map(int, month_match.groups()), 1)
+        else:
+            raise ValueError("unsupported format")
+    except ValueError as error:
+        raise ValueError(
+            f"Invalid snapshot date '{snapshot_date}': {error}. Expected "
+            f"YYYY-MM-DD, YYYYMMDD, YYYY-MM or YYYYMM."
+        )
+    period_end = (period_start + timedelta(days=31)).replace(day=1)
+    return period_start, period_end
+
+
+def get_snapshot_range(
+    snapshot_date: str, snapshot_end_date: str | None, granularity: str
+) -> dict:
+    """Half-open date range of the snapshots the data CTE is restricted to.
+
+    The range is compared with the partition field itself rather than a
+    function of it, so Redshift can skip blocks using the sort key zone maps.
+    """
+    snapshot_start_value, snapshot_end_value = get_snapshot_period(
+        snapshot_date, granularity
+    )
+    if snapshot_end_date:
+        snapshot_end_value = get_snapshot_period(snapshot_end_date, granularity)[1]
+    if snapshot_end_value <= snapshot_start_value:
+        raise ValueError(
+            f"Snapshot end date '{snapshot_end_date}' is before snapshot date "
+            f"'{snapshot_date}'."
+        )
+    return {
+        "snapshot_start_value": snapshot_start_value.isoformat(),
+        "snapshot_end_value": snapshot_end_value.isoformat(),
+    }
+
+
 def update_configs_from_input_params(configs: dict):
     pass
 
@@ -169,13 +1282,26 @@ def prepare_configs_from_rule_binding_id(
     metadata: dict | None = None,
     progress_watermark: bool = True,
     high_watermark_filter_exists: bool = False,
+    fuse_attribute_rules: bool = False,
+    share_entity_scan: bool = False,
+    parameterized_sql: bool = False,
+    materialize_validation_results: bool = False,
+    prune_data_columns: bool = False,
+    sampling: dict | None = None,
+    snapshot_date: str | None = None,
+    snapshot_end_date: str | None = None,
+    aggregate_summary: bool = False,
+    failed_records_sample_size: int = 0,
+    resolved_rule_binding_configs: dict | None = None,
+    high_watermark_values: dict | None = None,
 ) -> dict:
-    rule_binding = DqRuleBinding.from_dict(
-        rule_binding_id, rule_binding_configs
-    )
-    resolved_rule_binding_configs = rule_binding.resolve_all_configs_to_dict(
-        configs_cache=configs_cache,
-    )
+    if resolved_rule_binding_configs is None:
+        rule_binding = DqRuleBinding.from_dict(
+            rule_binding_id, rule_binding_configs
+        )
+        resolved_rule_binding_configs = rule_binding.resolve_all_configs_to_dict(
+            configs_cache=configs_cache,
+        )
     configs: dict[typing.Any, typing.Any] = {
         "configs": dict(resolved_rule_binding_configs)
     }
@@ -194,22 +1320,81 @@ def prepare_configs_from_rule_binding_id(
         {"configs_hashsum": sha256_digest(json.dumps(resolved_rule_binding_configs))}
     )
     configs.update({"progress_watermark": progress_watermark})
+    configs.update({"fuse_attribute_rules": fuse_attribute_rules})
+    configs.update({"share_entity_scan": share_entity_scan})
+    configs.update({"parameterized_sql": parameterized_sql})
+    configs.update({"materialize_validation_results": materialize_validation_results})
+    if prune_data_columns:
+        data_columns = get_data_columns(resolved_rule_binding_configs)
+        if data_columns is None:
+            logger.info(
+                f"Rule binding {rule_binding_id} has a rule whose SQL cannot be "
+                f"analyzed, reading all columns of its entity."
+            )
+        configs.update({"data_columns": data_columns})
+    # Sampling configured on the rule binding takes precedence over the CLI.
+    sampling = resolved_rule_binding_configs.get("sampling") or sampling
+    if sampling and not sampling["key_columns"]:
+        sampling = {
+            **sampling,
+            "key_columns": list(
+                resolved_rule_binding_configs.get("include_reference_columns") or []
+            ),
+        }
+    if sampling and not sampling["key_columns"]:
+        # A random sample could differ between the references to the data
+        # CTE, so counts, rows_validated and failed records would not match.
+        raise ValueError(
+            f"Rule binding {rule_binding_id} is sampled but has neither sampling "
+            f"'key_columns' nor 'include_reference_columns' to pick the sampled "
+            f"rows deterministically."
+        )
+    if sampling and not aggregate_summary:
+        raise ValueError(
+            f"Rule binding {rule_binding_id} is sampled, which requires "
+            f"aggregate_summary for the summary confidence intervals."
+        )
+    configs.update({"sampling": sampling})
+    snapshot_partition_fields = get_snapshot_partition_fields(
+        resolved_rule_binding_configs["entity_configs"].get("partition_fields")
+    )
+    if snapshot_date and snapshot_partition_fields:
+        snapshot_partition_field = snapshot_partition_fields[0]
+        configs.update({"snapshot_partition_field": snapshot_partition_field})
+        configs.update(
+            get_snapshot_range(
+                snapshot_date,
+                snapshot_end_date,
+                snapshot_partition_field["granularity"],
+            )
+        )
+    if materialize_validation_results:
+        # Session temp table both the summary and failed records SQL read from.
+        configs.update(
+            {
+                "validation_results_table": (
+                    f"dq_validation_results_{sha256_digest(rule_binding_id)[:16]}"
+                )
+            }
+        )
+    configs.update({"aggregate_summary": aggregate_summary})
+    configs.update({"failed_records_sample_size": failed_records_sample_size})
     incremental_time_filter_column = configs["configs"][
         "incremental_time_filter_column"
     ]
     logger.debug(f"Incremental time filter column {incremental_time_filter_column}")
     if incremental_time_filter_column:
         high_watermark_filter_exists = True
-        fully_qualified_table_name = (
-            f"{configs['configs']['entity_configs']['schema_name']}."
-            f"{configs['configs']['entity_configs']['table_name']}"
-        )
-        high_watermark_dict = get_high_watermark_value(
-            fully_qualified_table_name=fully_qualified_table_name,
-            rule_binding_id=rule_binding_id,
-            dq_summary_table_name=dq_summary_table_name,
-            redshift_client=redshift_client,
-        )
+        fully_qualified_table_name = get_high_watermark_table_id(configs["configs"])
+        if high_watermark_values and rule_binding_id in high_watermark_values:
+            high_watermark_dict = high_watermark_values[rule_binding_id]
+        else:
+            high_watermark_dict = get_high_watermark_value(
+                fully_qualified_table_name=fully_qualified_table_name,
+                rule_binding_id=rule_binding_id,
+                dq_summary_table_name=dq_summary_table_name,
+                redshift_client=redshift_client,
+            )
         configs.update(high_watermark_dict)
     configs.update({"high_watermark_filter_exists": high_watermark_filter_exists})
     logger.debug(f"Prepared json configs for {rule_binding_id}:\n{pformat(configs)}")
@@ -226,10 +1411,16 @@ def get_high_watermark_value(
         COALESCE(MAX(execution_ts), cast('2022-01-01 00:00:00' as TIMESTAMP)) as high_watermark,
         CURRENT_TIMESTAMP as current_timestamp_value
         FROM data_sciences.{dq_summary_table_name}
-        WHERE table_id = '{fully_qualified_table_name}'
-        AND rule_binding_id = '{rule_binding_id}'"""
+        WHERE table_id = :table_id
+        AND rule_binding_id = :rule_binding_id"""
     logger.info(f"High watermark query is \n {query}")
-    result = redshift_client.execute_query(query_string=query)
+    result = redshift_client.execute_query(
+        query_string=query,
+        parameters={
+            "table_id": fully_qualified_table_name,
+            "rule_binding_id": rule_binding_id,
+        },
+    )
     logger.info(f"High watermark query result:{pformat(result)}")
     high_watermark_value = ""
     current_timestamp_value = ""
@@ -245,6 +1436,74 @@ def get_high_watermark_value(
     return out_dict
 
 
+def get_high_watermark_table_id(resolved_rule_binding_configs: dict) -> str | None:
+    """table_id of the summary rows of an incremental rule binding, else None."""
+    if not resolved_rule_binding_configs.get("incremental_time_filter_column"):
+        return None
+    entity_configs = resolved_rule_binding_configs["entity_configs"]
+    return f"{entity_configs['schema_name']}.{entity_configs['table_name']}"
+
+
+def get_high_watermark_values(
+    table_rule_binding_ids: list[tuple[str, str]],
+    dq_summary_table_name: str,
+    redshift_client: RedshiftClient,
+    batch_size: int = HIGH_WATERMARK_BATCH_SIZE,
+) -> dict[str, dict]:
+    """get_high_watermark_value for many (table_id, rule_binding_id) pairs.
+
+    The pairs are looked up with one grouped query per batch_size pairs
+    instead of one query each, and every rule binding gets the
+    current_timestamp_value of the first query so they all read up to the
+    same point in time. Returns the values by rule binding id.
+    """
+    high_watermark_values: dict[str, dict] = {}
+    current_timestamp_value = None
+    for batch_start in range(0, len(table_rule_binding_ids), batch_size):
+        batch = table_rule_binding_ids[batch_start : batch_start + batch_size]
+        parameters = {}
+        requested = []
+        for index, (table_id, rule_binding_id) in enumerate(batch):
+            parameters[f"table_id_{index}"] = table_id
+            parameters[f"rule_binding_id_{index}"] = rule_binding_id
+            requested.append(
+                f"SELECT CAST(:table_id_{index} AS VARCHAR) AS table_id, "
+                f"CAST(:rule_binding_id_{index} AS VARCHAR) AS rule_binding_id"
+            )
+        requested_sql = "\n            UNION ALL ".join(requested)
+        query = f"""WITH requested AS (
+            {requested_sql}
+        )
+        SELECT
+            r.table_id,
+            r.rule_binding_id,
+            COALESCE(MAX(s.execution_ts), cast('2022-01-01 00:00:00' as TIMESTAMP)) as high_watermark,
+            CURRENT_TIMESTAMP as current_timestamp_value
+        FROM requested r
+        LEFT JOIN data_sciences.{dq_summary_table_name} s
+            ON s.table_id = r.table_id
+            AND s.rule_binding_id = r.rule_binding_id
+        GROUP BY r.table_id, r.rule_binding_id"""
+        logger.info(
+            f"High watermark query for {len(batch)} rule bindings is \n {query}"
+        )
+        result = redshift_client.execute_query(
+            query_string=query, parameters=parameters
+        )
+        for table_id, rule_binding_id, high_watermark_value, timestamp_value in result:
+            if current_timestamp_value is None:
+                current_timestamp_value = timestamp_value
+            high_watermark_values[rule_binding_id] = {
+                "high_watermark_value": high_watermark_value,
+                "current_timestamp_value": current_timestamp_value,
+            }
+    logger.info(
+        f"Resolved high watermarks of {len(high_watermark_values)} rule bindings "
+        f"at {current_timestamp_value}"
+    )
+    return high_watermark_values
+
+
 def create_entity_summary_model(
     entity_table_id: str,
     entity_target_rule_binding_configs: dict,
@@ -283,9 +1542,33 @@ def write_sql_string_as_dbt_model(
 def update_config_sql_string(configs: dict,
                              config_key: str,
                              config_value: str):
-    generated_sql_string = configs.get("generated_sql_string")
     if config_key == 'snapshot_date':
-        generated_sql_string = Template(generated_sql_string).safe_substitute({'tgt_tbl_snapshot_value':config_value})
-        configs.update(dict(generated_sql_string=generated_sql_string))
+        sql_string_keys = [
+            sql_string_key
+            for sql_string_key in (
+                "validation_results_sql_string",
+                "generated_sql_string",
+                "failed_records_sql_string",
+            )
+            if sql_string_key in configs
+        ]
+        if configs.get("parameterized_sql") and not get_sql_parameter_names(
+            [configs[sql_string_key] for sql_string_key in sql_string_keys],
+            ["tgt_tbl_snapshot_value"],
+        ):
+            # Only placeholders the SQL uses are bound.
+            return configs
+        for sql_string_key in sql_string_keys:
+            if configs.get("parameterized_sql"):
+                sql_string = parameterize_sql_string(
+                    configs.get(sql_string_key), ["tgt_tbl_snapshot_value"]
+                )
+            else:
+                sql_string = Template(configs.get(sql_string_key)).safe_substitute(
+                    {'tgt_tbl_snapshot_value': config_value}
+                )
+            configs.update({sql_string_key: sql_string})
+        if configs.get("parameterized_sql"):
+            configs["sql_parameters"].update({'tgt_tbl_snapshot_value': config_value})
 
     return configs
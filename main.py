@@ -11,7 +11,14 @@ from logger import getlogger
 import click
 from typing import Optional
 import lib
+from classes.dq_compiled_sql_store import DqCompiledSqlStore
+from classes.dq_execution_scheduler import DqExecutionScheduler
+from classes.dq_rule_binding import validate_sampling_configs
+from classes.dq_config_type import DqConfigType
+from integration.redshift.redshiftclient import COLUMNAR_OUTPUT_MODULES
 from integration.redshift.redshiftclient import RedshiftClient
+from integration.redshift.redshiftclient import import_columnar_module
+from integration.redshift import redshift_utils
 from utils import assert_not_none_or_empty
 
 logger = getlogger()
@@ -74,22 +81,151 @@ coloredlogs.install(logger=logger)
 )
 @click.option(
     "--num_threads",
-    help="Number of concurrent bigquery operations that can be "
-    "increased to reduce run-time. We advice setting "
+    help="Number of concurrent operations that can be "
+    "increased to reduce run-time, including the number of processes "
+    "used to parse and validate config files. We advice setting "
     "this to number of cores of your run-environment machines",
     default=1,
     type=int,
 )
+@click.option(
+    "--fuse_attribute_rules",
+    help="If True, all RT_ATTRIBUTE_LEVEL rules of a rule binding are evaluated "
+    "in a single scan of the source data instead of one scan per rule.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--share_entity_scan",
+    help="If True, rule bindings reading the same entity with the same incremental "
+    "window and row filter share one temp table scan of the source data. "
+    "Cannot be combined with --parameterized_sql.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--aggregate_summary",
+    help="If True, the generated SQL returns one summary row per rule with "
+    "success, failed and null counts instead of one row per validated row.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--failed_records_sample_size",
+    help="Maximum number of failing keys per rule returned in the "
+    "failed_keys_sample column. Only takes effect with --aggregate_summary.",
+    default=0,
+    type=int,
+)
+@click.option(
+    "--parameterized_sql",
+    help="If True, the high watermark, current timestamp and snapshot date are "
+    "sent as bind parameters instead of being written into the generated SQL, "
+    "so the SQL text stays the same between runs. Cannot be combined with "
+    "--share_entity_scan, whose shared scan is named after these values.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--materialize_validation_results",
+    help="If True, each rule binding's validation results are written once into a "
+    "session temp table that both the summary and failed records SQL read from. "
+    "The temp table SQL must run first, on the same connection.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--prune_data_columns",
+    help="If True, the data CTE selects only the entity columns the rule binding "
+    "uses instead of all columns. Rule bindings with a rule whose SQL cannot be "
+    "analyzed still select all columns. With --share_entity_scan, the shared scan "
+    "selects the columns used by any of its rule bindings.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--sample_fraction",
+    help="Validate this fraction of the rows of each entity instead of all rows. "
+    "Requires --aggregate_summary, whose summaries then carry the sampling rate "
+    "and 95% confidence intervals. A 'sampling' block in a rule binding overrides this.",
+    type=float,
+)
+@click.option(
+    "--sample_rows",
+    help="Validate at most this many rows of each entity instead of all rows. "
+    "Requires --aggregate_summary and cannot be combined with --sample_fraction.",
+    type=int,
+)
+@click.option(
+    "--sample_key_columns",
+    help="Comma-separated columns hashed to pick sampled rows deterministically. "
+    "Defaults to the rule binding's reference columns. Rule bindings with "
+    "neither cannot be sampled.",
+    type=str,
+)
+@click.option(
+    "--lazy_config_loading",
+    help="If True, only the configs reachable from the requested rule_binding_ids "
+    "are parsed, validated and loaded. Ignored when rule_binding_ids is 'ALL'.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--execute_rule_bindings",
+    help="If True, run the generated SQL of every rule binding on Redshift "
+    "with bounded concurrency and fail if any of them fails. Summary results "
+    "are only logged, with --summary_to_stdout, and not written to a summary "
+    "table. Defaults to False: the SQL is only generated, as it always was.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--max_concurrent_queries",
+    help="Maximum number of rule binding jobs running on Redshift at once, "
+    "e.g. the WLM query slots available to DQ runs. Defaults to --num_threads. "
+    "Only takes effect with --execute_rule_bindings.",
+    type=int,
+)
+@click.option(
+    "--max_concurrent_queries_per_entity",
+    help="Maximum number of rule binding jobs reading the same entity at once. "
+    "Not limited by default.",
+    type=int,
+)
+@click.option(
+    "--fetch_batch_size",
+    help="Number of result rows fetched at a time from the server-side cursor "
+    "of each summary and failed records query.",
+    default=1000,
+    type=int,
+)
+@click.option(
+    "--result_format",
+    help="Format summary and failed records results are handed on in: 'rows' of "
+    "Python values, or each fetched batch converted to columns as 'numpy' "
+    "arrays or 'arrow' record batches. Results are always fetched as rows. "
+    "Columnar formats need numpy or pyarrow installed.",
+    type=click.Choice(["rows", "numpy", "arrow"]),
+    default="rows",
+)
 @click.option(
     "--snapshot_date",
     help="Pass snapshot date if its daily table else path snapshot year month value",
     type=str,
 )
+@click.option(
+    "--snapshot_end_date",
+    help="Last snapshot date or year month value of a range of snapshots starting "
+    "at --snapshot_date. Entities with a partition field that has a granularity "
+    "only read the snapshots in this range.",
+    type=str,
+)
 def main(
         rule_binding_ids: str,
         rule_binding_config_path: str,
         target_summary_table: str,
         snapshot_date: str,
+        snapshot_end_date: Optional[str],
         environment_target: Optional[str],
         dry_run: bool,
         progress_watermark: bool,
@@ -97,6 +233,22 @@ def main(
         print_sql_queries: bool = False,
         skip_sql_validation: bool = False,
         summary_to_stdout: bool = False,
+        lazy_config_loading: bool = False,
+        fuse_attribute_rules: bool = False,
+        share_entity_scan: bool = False,
+        parameterized_sql: bool = False,
+        materialize_validation_results: bool = False,
+        prune_data_columns: bool = False,
+        sample_fraction: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        sample_key_columns: Optional[str] = None,
+        aggregate_summary: bool = False,
+        failed_records_sample_size: int = 0,
+        max_concurrent_queries: Optional[int] = None,
+        max_concurrent_queries_per_entity: Optional[int] = None,
+        execute_rule_bindings: bool = False,
+        fetch_batch_size: int = 1000,
+        result_format: str = "rows",
         debug: bool = False,
 ):
     if debug:
@@ -109,7 +261,14 @@ def main(
     redshift_client = None
     try:
         logger.info("Starting DQ run with configs:")
-        redshift = RedshiftClient()
+        # Configs are prepared on num_threads threads and rule binding jobs
+        # run on max_concurrent_queries, each with its own pooled connection.
+        if not max_concurrent_queries:
+            max_concurrent_queries = max(num_threads, 1)
+        redshift = RedshiftClient(
+            max_connections=max(num_threads, max_concurrent_queries, 1)
+        )
+        redshift_client = redshift
         logger.info(f"redshift-{redshift}")
         dq_summary_table_name = "test_dq_summary"
         dq_summary_table_exists = False
@@ -129,55 +288,117 @@ def main(
             )
         configs_path = Path(rule_binding_config_path)
         logger.debug(f"Loading rule bindings from: {configs_path.absolute()}")
-        all_rule_bindings = lib.load_rule_bindings_config(Path(configs_path))
-        logger.debug(f"all_rule_bindings: {all_rule_bindings}")
         target_rule_binding_ids = [
             r.strip().upper() for r in rule_binding_ids.split(",")
         ]
-        if len(target_rule_binding_ids) == 1 and target_rule_binding_ids[0] == "ALL":
+        run_all_rule_bindings = (
+            len(target_rule_binding_ids) == 1 and target_rule_binding_ids[0] == "ALL"
+        )
+        if lazy_config_loading and not run_all_rule_bindings:
+            configs_cache, all_configs = lib.prepare_lazy_configs_cache(
+                configs_path=configs_path,
+                rule_binding_ids=target_rule_binding_ids,
+                num_processes=num_threads,
+            )
+        else:
+            configs_cache, all_configs = lib.prepare_incremental_configs_cache(
+                configs_path=configs_path, num_processes=num_threads
+            )
+        all_rule_bindings = all_configs[DqConfigType.RULE_BINDINGS]
+        logger.debug(f"all_rule_bindings: {all_rule_bindings}")
+        if run_all_rule_bindings:
             target_rule_binding_ids = [
                 rule_binding.upper() for rule_binding in all_rule_bindings.keys()
             ]
         logger.info(f"Preparing SQL for rule bindings: {target_rule_binding_ids}")
-        configs_cache = lib.prepare_configs_cache(configs_path=Path(configs_path))
         target_entity_summary_configs: dict = (
             configs_cache.get_entities_configs_from_rule_bindings(
                 target_rule_binding_ids=target_rule_binding_ids,
             )
         )
         logger.info(f"target_entity_summary_configs-{target_entity_summary_configs}")
-        failed_queries_configs = dict()
-        # Create Rule_binding views
         for rule_binding_id in target_rule_binding_ids:
-            rule_binding_configs = all_rule_bindings.get(rule_binding_id, None)
             assert_not_none_or_empty(
-                rule_binding_configs,
+                all_rule_bindings.get(rule_binding_id, None),
                 f"Target Rule Binding Id: {rule_binding_id} not found "
                 f"in config path {configs_path.absolute()}.",
             )
-            if debug:
+        resolved_rule_bindings = configs_cache.resolve_rule_bindings(
+            target_rule_binding_ids
+        )
+        if snapshot_end_date and not snapshot_date:
+            raise ValueError("--snapshot_end_date requires --snapshot_date.")
+        if share_entity_scan and parameterized_sql:
+            # The shared scan temp table is named after the hash of the scan
+            # with its incremental window written in, so the rule binding SQL
+            # reading it would still change between runs.
+            raise ValueError(
+                "--share_entity_scan cannot be combined with --parameterized_sql."
+            )
+        compiled_sql_store = DqCompiledSqlStore()
+        sampling = None
+        if sample_fraction is not None or sample_rows is not None:
+            sampling = validate_sampling_configs(
+                "--sample_fraction/--sample_rows",
+                {
+                    "fraction": sample_fraction,
+                    "rows": sample_rows,
+                    "key_columns": sample_key_columns,
+                },
+            )
+            if not aggregate_summary:
+                raise ValueError(
+                    "--sample_fraction/--sample_rows require --aggregate_summary."
+                )
+        render_seconds = 0.0
+        failed_queries_configs = dict()
+        # Create Rule_binding views
+        if debug:
+            for rule_binding_id in target_rule_binding_ids:
                 logger.debug(
                     f"Creating sql string from configs for rule binding: "
                     f"{rule_binding_id}"
                 )
                 logger.debug(
-                    f"Rule binding config json:\n{pformat(rule_binding_configs)}"
+                    f"Rule binding config json:\n"
+                    f"{pformat(all_rule_bindings.get(rule_binding_id))}"
                 )
-            high_watermark_filter_exists = True
-            logger.info(f"Calling create_rule_binding_view_model:{redshift}")
-            configs = lib.create_rule_binding_view_model(
-                rule_binding_id=rule_binding_id,
-                rule_binding_configs=rule_binding_configs,
-                dq_summary_table_name=dq_summary_table_name,
-                configs_cache=configs_cache,
-                environment=None,
-                metadata=None,
-                debug=print_sql_queries,
-                progress_watermark=True,
-                dq_summary_table_exists=dq_summary_table_exists,
-                high_watermark_filter_exists=high_watermark_filter_exists,
-                redshift_client=redshift,
-            )
+        high_watermark_filter_exists = True
+        logger.info(f"Calling create_rule_binding_view_models:{redshift}")
+        rule_binding_view_models = lib.create_rule_binding_view_models(
+            rule_binding_ids=target_rule_binding_ids,
+            all_rule_bindings=all_rule_bindings,
+            dq_summary_table_name=dq_summary_table_name,
+            configs_cache=configs_cache,
+            environment=None,
+            metadata=None,
+            debug=print_sql_queries,
+            progress_watermark=True,
+            dq_summary_table_exists=dq_summary_table_exists,
+            high_watermark_filter_exists=high_watermark_filter_exists,
+            fuse_attribute_rules=fuse_attribute_rules,
+            share_entity_scan=share_entity_scan,
+            parameterized_sql=parameterized_sql,
+            materialize_validation_results=materialize_validation_results,
+            prune_data_columns=prune_data_columns,
+            sampling=sampling,
+            snapshot_date=snapshot_date,
+            snapshot_end_date=snapshot_end_date,
+            aggregate_summary=aggregate_summary,
+            failed_records_sample_size=failed_records_sample_size,
+            redshift_client=redshift,
+            resolved_rule_bindings=resolved_rule_bindings,
+            compiled_sql_store=compiled_sql_store,
+            num_threads=num_threads,
+        )
+        failed_rule_bindings = dict()
+        for rule_binding_id, configs in rule_binding_view_models.items():
+            if isinstance(configs, Exception):
+                failed_rule_bindings[rule_binding_id] = configs
+                continue
+            render_seconds += configs["render_seconds"]
+            if snapshot_date:
+                lib.update_config_sql_string(configs, 'snapshot_date', snapshot_date)
             if not skip_sql_validation:
                 logger.debug(
                     f"Validating generated SQL code for rule binding "
@@ -187,16 +408,23 @@ def main(
                 logger.debug(
                     f"Generated SQL: {target_sql_str}",
                 )
-                lib.update_config_sql_string(configs,'snapshot_date',snapshot_date)
 #                logger.info(
 #                    f"after input_param update:{Template(target_sql_str).safe_substitute({'tgt_snapshot_value': snapshot_date})}")
                 logger.info(
                     f"after input_param update:{configs.get('generated_sql_string')}")
+                if parameterized_sql:
+                    logger.info(f"SQL parameters: {configs.get('sql_parameters')}")
+                if materialize_validation_results:
+                    logger.debug(
+                        f"Validation results SQL: "
+                        f"{configs.get('validation_results_sql_string')}"
+                    )
                 #logger.debug(
                 #    f"Generated SQL: {configs.get('failed_records_sql_string')}",
                 #)
                 #redshift_client.check_query_dry_run(
-                #    query_string=configs.get("generated_sql_string")
+                #    query_string=configs.get("generated_sql_string"),
+                #    parameters=configs.get("sql_parameters"),
                 #)
             #lib.write_sql_string_as_dbt_model(
             #    model_id=rule_binding_id,
@@ -206,6 +434,89 @@ def main(
             failed_queries_configs[
                 f"{rule_binding_id}_failed_records_sql_string"
             ] = configs.get("failed_records_sql_string")
+        if share_entity_scan:
+            # Temp tables live for the session, so these must run on the same
+            # connection ahead of the rule binding SQL that reads from them.
+            rendered_rule_binding_configs = [
+                configs
+                for configs in rule_binding_view_models.values()
+                if not isinstance(configs, Exception)
+            ]
+            if prune_data_columns:
+                lib.project_entity_data_scans(rendered_rule_binding_configs)
+            entity_data_scans = lib.get_entity_data_scans(
+                rendered_rule_binding_configs
+            )
+            logger.info(
+                f"{len(target_rule_binding_ids) - len(failed_rule_bindings)} rule "
+                f"bindings share {len(entity_data_scans)} entity data scans."
+            )
+            if print_sql_queries:
+                for entity_data_scan_sql_string in entity_data_scans.values():
+                    logger.info(entity_data_scan_sql_string)
+        logger.debug(
+            f"Resolved configs cache stats: {configs_cache.get_resolved_configs_stats()}"
+        )
+        logger.debug(f"Compiled SQL store stats: {compiled_sql_store.get_stats()}")
+        logger.debug(f"Redshift connection pool stats: {redshift.get_pool_stats()}")
+        logger.debug(f"Redshift catalog cache stats: {redshift.get_catalog_stats()}")
+        logger.info(
+            f"Rendered SQL for {len(target_rule_binding_ids)} rule bindings "
+            f"in {render_seconds:.3f}s (render only)"
+        )
+        if failed_rule_bindings:
+            raise ValueError(
+                f"Failed to generate SQL for {len(failed_rule_bindings)} of "
+                f"{len(target_rule_binding_ids)} rule bindings:\n"
+                + "\n".join(
+                    f"{rule_binding_id}: {error}"
+                    for rule_binding_id, error in failed_rule_bindings.items()
+                )
+            )
+        if execute_rule_bindings and not dry_run:
+            if result_format != "rows":
+                # Fail before any query runs, not in every job once its
+                # first batch is converted.
+                import_columnar_module(COLUMNAR_OUTPUT_MODULES[result_format])
+            scheduler = DqExecutionScheduler(
+                redshift_client=redshift,
+                max_concurrency=max_concurrent_queries,
+                max_concurrency_per_entity=max_concurrent_queries_per_entity,
+                fetch_batch_size=fetch_batch_size,
+                result_format=result_format,
+                result_handler=(
+                    log_summary_result
+                    if summary_to_stdout and target_summary_table
+                    else None
+                ),
+            )
+            for job in lib.get_rule_binding_execution_jobs(rule_binding_view_models):
+                scheduler.submit(job)
+            executions = scheduler.run()
+            if debug:
+                logger.debug(
+                    "Rule binding executions:\n"
+                    + pformat(
+                        {
+                            rule_binding_id: execution.to_dict()
+                            for rule_binding_id, execution in executions.items()
+                        }
+                    )
+                )
+            execution_report = scheduler.get_report()
+            logger.info(f"DQ execution report:\n{pformat(execution_report)}")
+            if execution_report["failed_rule_bindings"]:
+                raise RuntimeError(
+                    f"{len(execution_report['failed_rule_bindings'])} of "
+                    f"{execution_report['rule_bindings']} rule bindings did not "
+                    f"run successfully:\n"
+                    + "\n".join(
+                        f"{rule_binding_id}: {error}"
+                        for rule_binding_id, error in execution_report[
+                            "failed_rule_bindings"
+                        ].items()
+                    )
+                )
 
     except Exception as error:
         logger.error(error, exc_info=True)
@@ -214,8 +525,13 @@ def main(
         if redshift_client:
             redshift.close_connection()
 
-#if __name__=="__main__":
-main()
+def log_summary_result(statement, batch) -> None:
+    if statement.sql_string_key == "generated_sql_string":
+        redshift_utils.log_summary(batch, rule_binding_id=statement.rule_binding_id)
+
+
+if __name__=="__main__":
+    main()
 
 
 
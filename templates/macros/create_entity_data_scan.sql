@@ -0,0 +1,50 @@
+{%- macro create_entity_data_scan(configs, environment, dq_summary_table_exists, high_watermark_value, current_timestamp_value) -%}
+{% set filter_sql_expr = configs.get('row_filter_configs').get('filter_sql_expr') -%}
+{% set entity_configs = configs.get('entity_configs') -%}
+{% set partition_fields = entity_configs.get('partition_fields')-%}
+{% set schema_name = entity_configs.get('schema_name') -%}
+{% set table_name = entity_configs.get('table_name') -%}
+{% if environment and entity_configs.get('environment_override') -%}
+  {% set env_override = entity_configs.get('environment_override') %}
+  {% if env_override.get(environment|lower) %}
+    {% set override_values = env_override.get(environment|lower) %}
+    {% if override_values.get('table_name') -%}
+        {% set table_name = override_values.get('table_name') -%}
+    {% endif -%}
+    {% if override_values.get('schema_name') -%}
+        {% set schema_name = override_values.get('schema_name') -%}
+    {% endif -%}
+  {% endif %}
+{% endif -%}
+{% set fully_qualified_table_name = "%s.%s" % (schema_name, table_name) -%}
+{%- if configs.get('incremental_time_filter_column') and dq_summary_table_exists -%}
+{% set time_column_id = configs.get('incremental_time_filter_column') %}
+{% endif -%}
+    SELECT
+{%- if entity_data_scan_columns %}
+      {{ entity_data_scan_columns|join(', ') }}
+{%- else %}
+      *
+{%- endif %}
+    FROM {{ fully_qualified_table_name }} d
+{%- if configs.get('incremental_time_filter_column') and dq_summary_table_exists %}
+    WHERE
+      d.{{ time_column_id }}
+          BETWEEN CAST('{{ high_watermark_value }}' AS TIMESTAMP) AND CAST('{{ current_timestamp_value }}' AS TIMESTAMP)
+      {{ filter_sql_expr }}
+{% else %}
+    WHERE
+      {{ filter_sql_expr }}
+{% endif -%}
+{%- if partition_fields %}
+    {% for field in partition_fields %}
+        AND {{ field['name'] }} IS NOT NULL
+    {%- endfor -%}
+{% endif -%}
+{%- if snapshot_partition_field %}
+        AND d.{{ snapshot_partition_field['name'] }} >= CAST('{{ snapshot_start_value }}' AS DATE)
+        AND d.{{ snapshot_partition_field['name'] }} < CAST('{{ snapshot_end_value }}' AS DATE)
+{%- endif %}
+{%- endmacro -%}
+
+{{-  create_entity_data_scan(configs, environment, dq_summary_table_exists, high_watermark_value, current_timestamp_value) -}}
@@ -1,6 +1,9 @@
 {% from 'macros.sql' import validate_simple_rule -%}
 {% from 'macros.sql' import validate_complex_rule -%}
 {% from 'macros.sql' import validate_entity_rule -%}
+{% from 'macros.sql' import validate_fused_simple_rules -%}
+{% from 'macros.sql' import sample_data_clause -%}
+{% from 'macros.sql' import sampled_percentage_columns -%}
 {%- macro create_rule_binding_view(configs, environment, dq_summary_table_name, metadata, configs_hashsum, progress_watermark, dq_summary_table_exists, high_watermark_value, current_timestamp_value, generated_sql_string) -%}
 {% set rule_binding_id = configs.get('rule_binding_id') -%}
 {% set rule_configs_dict = configs.get('rule_configs_dict') -%}
@@ -32,18 +35,38 @@
 {% endif -%}
 {% set fully_qualified_table_name = "%s.%s" % (schema_name, table_name) -%}
 {% set _dummy = metadata.update(configs.get('metadata', '')) -%}
+{% set fused_attribute_rules = {} -%}
+{% if fuse_attribute_rules -%}
+{% for rule_id, rule_configs in rule_configs_dict.items() if rule_configs.get('rule_type') == "CUSTOM_SQL_EXPR" -%}
+{% set _dummy = fused_attribute_rules.update({rule_id: rule_configs}) -%}
+{% endfor -%}
+{% if fused_attribute_rules|length < 2 -%}
+{% set _dummy = fused_attribute_rules.clear() -%}
+{% endif -%}
+{% endif -%}
+{% if validation_results_only -%}
+CREATE TEMP TABLE {{ validation_results_table }} AS
+{% endif -%}
 WITH
 {%- if configs.get('incremental_time_filter_column') and dq_summary_table_exists -%}
 {% set time_column_id = configs.get('incremental_time_filter_column') %}
 {% endif -%}
+{%- if not materialize_validation_results or validation_results_only -%}
 zero_record AS (
     SELECT
         '{{ rule_binding_id }}'::text AS rule_binding_id
 ),
 data AS (
     SELECT
+{%- if data_columns %}
+      {{ data_columns|join(', ') }},
+{%- else %}
        *,
+{%- endif %}
       '{{ rule_binding_id }}'::text AS rule_binding_id
+{%- if share_entity_scan %}
+    FROM {{ shared_entity_data_table }} d{{ '\n' }}
+{%- else %}
     FROM {{ fully_qualified_table_name }} d
 {%- if configs.get('incremental_time_filter_column') and dq_summary_table_exists %}
     WHERE
@@ -59,9 +82,17 @@ data AS (
         AND {{ field['name'] }} IS NOT NULL
     {%- endfor -%}
 {% endif -%}
+{%- if snapshot_partition_field %}
+        AND d.{{ snapshot_partition_field['name'] }} >= CAST('{{ snapshot_start_value }}' AS DATE)
+        AND d.{{ snapshot_partition_field['name'] }} < CAST('{{ snapshot_end_value }}' AS DATE)
+{%- endif %}
+{%- endif -%}
+{%- if sampling %}
+{{ sample_data_clause(sampling, not share_entity_scan) }}
+{%- endif -%}
 ),
 validation_results AS (
-{% for rule_id, rule_configs in rule_configs_dict.items() %}
+{% for rule_id, rule_configs in rule_configs_dict.items() if rule_id not in fused_attribute_rules %}
     {%- if rule_configs.get('rule_type') == "CUSTOM_SQL_STATEMENT" -%}
     {% for rule_runtime_params in rule_ids %}
     {%- if rule_runtime_params.get(rule_id) -%}
@@ -76,11 +107,24 @@ validation_results AS (
       {{ validate_simple_rule(rule_id, rule_configs, rule_binding_id, fully_qualified_table_name, include_reference_columns) }}
     {%- endif -%}
     {% set column_config.target_key_column = [] -%}
-    {% if loop.nextitem is defined %}
+    {% if loop.nextitem is defined or fused_attribute_rules %}
     UNION ALL
     {% endif -%}
 {%- endfor -%}
-),
+{%- if fused_attribute_rules %}
+      {{ validate_fused_simple_rules(fused_attribute_rules, rule_binding_id, fully_qualified_table_name, include_reference_columns) }}
+{%- endif -%}
+)
+{%- if validation_results_only %}
+SELECT
+  r.*,
+  (SELECT COUNT(*) FROM data) AS rows_validated
+FROM
+  validation_results r
+{%- else %},
+{%- endif %}
+{%- endif %}
+{%- if not validation_results_only %}
 all_validation_results AS (
   SELECT
     r.execution_ts AS execution_ts
@@ -101,7 +145,14 @@ all_validation_results AS (
             {{ '\n' }}
         {% endif %}
     {%- endfor -%}
+    {% if materialize_validation_results -%}
+    ,r.rows_validated AS rows_validated
+    {% else -%}
     ,(SELECT COUNT(*) FROM data) AS rows_validated
+    {% endif -%}
+    {% if sampling -%}
+    ,CAST({{ sampling.get('fraction') if sampling.get('fraction') else 'NULL' }} AS FLOAT) AS sampling_rate
+    {% endif -%}
     ,'{{ metadata|tojson }}' AS metadata_json_string
     ,'{{ configs_hashsum }}' AS configs_hashsum
     ,r.rule_binding_id||'_'||r.rule_id||'_'||r.execution_ts AS dq_run_id
@@ -109,12 +160,102 @@ all_validation_results AS (
       ,{{ progress_watermark|upper }} AS progress_watermark
     {% endif %}
   FROM
-    validation_results r
+    {{ validation_results_table if materialize_validation_results else 'validation_results' }} r
 )
+{%- if aggregate_summary %}
+{%- if failed_records_sample_size %},
+failed_keys_sample AS (
+  SELECT
+    rule_id,
+    column_key,
+    LISTAGG(failed_key, ',') WITHIN GROUP (ORDER BY failed_key) AS failed_keys_sample
+  FROM (
+    SELECT
+      rule_id,
+      column_key,
+      failed_key,
+      ROW_NUMBER() OVER (PARTITION BY rule_id, column_key ORDER BY failed_key) AS failed_key_rank
+    FROM (
+      SELECT
+        rule_id,
+        column_key,
+{%- if include_reference_columns %}
+        {% for ref_column_name in include_reference_columns -%}
+        COALESCE(CAST({{ ref_column_name }} AS varchar), ''){% if not loop.last %} || '|' || {% endif %}
+        {%- endfor %} AS failed_key
+{%- else %}
+        CAST(tgt_column_value AS varchar) AS failed_key
+{%- endif %}
+      FROM
+        all_validation_results
+      WHERE
+        simple_rule_row_is_valid IS FALSE
+    ) failed_keys
+  ) ranked_failed_keys
+  WHERE
+    failed_key_rank <= {{ failed_records_sample_size|int }}
+  GROUP BY
+    rule_id,
+    column_key
+)
+{%- endif %}
+SELECT
+  v.execution_ts,
+  v.rule_binding_id,
+  v.rule_id,
+  v.table_id,
+  v.column_key,
+  v.dimension,
+  v.metadata_json_string,
+  v.configs_hashsum,
+  v.dq_run_id,
+  v.rows_validated,
+  MAX(v.complex_rule_validation_errors_count) AS complex_rule_validation_errors_count,
+  BOOL_AND(v.complex_rule_validation_success_flag) AS complex_rule_validation_success_flag,
+  CASE
+    WHEN v.rows_validated = 0 THEN NULL
+    WHEN MAX(v.complex_rule_validation_errors_count) IS NOT NULL THEN NULL
+    ELSE COUNT(CASE WHEN v.simple_rule_row_is_valid IS TRUE THEN 1 ELSE NULL END)
+  END AS success_count,
+  CASE
+    WHEN v.rows_validated = 0 THEN NULL
+    WHEN MAX(v.complex_rule_validation_errors_count) IS NOT NULL THEN NULL
+    ELSE COUNT(CASE WHEN v.simple_rule_row_is_valid IS FALSE THEN 1 ELSE NULL END)
+  END AS failed_count,
+  CASE
+    WHEN v.rows_validated = 0 THEN NULL
+    WHEN MAX(v.complex_rule_validation_errors_count) IS NOT NULL THEN NULL
+    ELSE COUNT(CASE WHEN v.simple_rule_row_is_valid IS NULL THEN 1 ELSE NULL END)
+  END AS null_count,
+{%- if sampling %}
+  MAX(v.sampling_rate) AS sampling_rate,
+  {{- sampled_percentage_columns('success', 'IS TRUE') }}
+  {{- sampled_percentage_columns('failed', 'IS FALSE') }}
+  {{- sampled_percentage_columns('null', 'IS NULL') }}
+{%- endif %}
+{%- if failed_records_sample_size %}
+  MAX(s.failed_keys_sample) AS failed_keys_sample
+{%- else %}
+  CAST(NULL AS varchar) AS failed_keys_sample
+{%- endif %}
+FROM
+  all_validation_results v
+{%- if failed_records_sample_size %}
+LEFT JOIN
+  failed_keys_sample s
+ON
+  v.rule_id = s.rule_id
+  AND v.column_key = s.column_key
+{%- endif %}
+GROUP BY
+  1,2,3,4,5,6,7,8,9,10
+{%- else %}
 SELECT
   *
 FROM
   all_validation_results
+{%- endif %}
+{%- endif %}
 
 {%- endmacro -%}
 
@@ -1,6 +1,8 @@
 {% from 'macros.sql' import validate_simple_rule -%}
 {% from 'macros.sql' import validate_complex_rule -%}
 {% from 'macros.sql' import validate_entity_rule -%}
+{% from 'macros.sql' import validate_fused_simple_rules -%}
+{% from 'macros.sql' import sample_data_clause -%}
 {%- macro create_failed_records_sql(configs, environment, dq_summary_table_name, metadata, configs_hashsum, progress_watermark, dq_summary_table_exists, high_watermark_value, current_timestamp_value, generated_sql_string) -%}
 {% set rule_binding_id = configs.get('rule_binding_id') -%}
 {% set rule_configs_dict = configs.get('rule_configs_dict') -%}
@@ -30,18 +32,36 @@
 {% endif -%}
 {% set fully_qualified_table_name = "%s.%s" % (schema_name, table_name) -%}
 {% set _dummy = metadata.update(configs.get('metadata', '')) -%}
+{% set fused_attribute_rules = {} -%}
+{% if fuse_attribute_rules -%}
+{% for rule_id, rule_configs in rule_configs_dict.items() if rule_configs.get('rule_type') == "CUSTOM_SQL_EXPR" -%}
+{% set _dummy = fused_attribute_rules.update({rule_id: rule_configs}) -%}
+{% endfor -%}
+{% if fused_attribute_rules|length < 2 -%}
+{% set _dummy = fused_attribute_rules.clear() -%}
+{% endif -%}
+{% endif -%}
 WITH
 {%- if configs.get('incremental_time_filter_column') and dq_summary_table_exists -%}
 {% set time_column_id = configs.get('incremental_time_filter_column') %}
 {% endif -%}
+{%- if not materialize_validation_results -%}
 zero_record AS (
     SELECT
         '{{ rule_binding_id }}'::text AS rule_binding_id
 ),
 data AS (
     SELECT
+{%- if data_columns %}
+      {{ data_columns|join(', ') }},
+{%- else %}
       *,
+{%- endif %}
       '{{ rule_binding_id }}'::text AS rule_binding_id
+{%- if share_entity_scan %}
+    FROM
+      {{ shared_entity_data_table }} d{{ '\n' }}
+{%- else %}
     FROM
       {{ fully_qualified_table_name }} d
 {%- if configs.get('incremental_time_filter_column') and dq_summary_table_exists %}
@@ -58,9 +78,17 @@ data AS (
         AND {{ field['name'] }} IS NOT NULL
     {%- endfor -%}
 {% endif -%}
+{%- if snapshot_partition_field %}
+        AND d.{{ snapshot_partition_field['name'] }} >= CAST('{{ snapshot_start_value }}' AS DATE)
+        AND d.{{ snapshot_partition_field['name'] }} < CAST('{{ snapshot_end_value }}' AS DATE)
+{%- endif %}
+{%- endif -%}
+{%- if sampling %}
+{{ sample_data_clause(sampling, not share_entity_scan) }}
+{%- endif -%}
 ),
 validation_results AS (
-{% for rule_id, rule_configs in rule_configs_dict.items() %}
+{% for rule_id, rule_configs in rule_configs_dict.items() if rule_id not in fused_attribute_rules %}
     {%- if rule_configs.get('rule_type') == "CUSTOM_SQL_STATEMENT" -%}
       {{ validate_complex_rule(rule_id, rule_configs, rule_binding_id, fully_qualified_table_name, include_reference_columns) }}
     {%- elif rule_configs.get('rule_type') == "ENTITY_LEVEL" -%}
@@ -68,11 +96,15 @@ validation_results AS (
     {%- else -%}
       {{ validate_simple_rule(rule_id, rule_configs, rule_binding_id, fully_qualified_table_name, include_reference_columns) }}
     {%- endif -%}
-    {% if loop.nextitem is defined %}
+    {% if loop.nextitem is defined or fused_attribute_rules %}
     UNION ALL
     {% endif %}
 {%- endfor -%}
+{%- if fused_attribute_rules %}
+      {{ validate_fused_simple_rules(fused_attribute_rules, rule_binding_id, fully_qualified_table_name, include_reference_columns) }}
+{%- endif -%}
 ),
+{%- endif %}
 all_validation_results AS (
   SELECT
     r.rule_binding_id AS rule_binding_id
@@ -86,7 +118,7 @@ all_validation_results AS (
     {%- endfor -%}
 
   FROM
-    validation_results r
+    {{ validation_results_table if materialize_validation_results else 'validation_results' }} r
 )
 SELECT
   *
@@ -35,6 +35,79 @@
     zero_record.rule_binding_id = data.rule_binding_id
 {% endmacro -%}
 
+{% macro validate_fused_simple_rules(attribute_rules, rule_binding_id, fully_qualified_table_name, include_reference_columns ) -%}
+{#- Same output as one validate_simple_rule per rule, but every verdict is
+    computed in a single pass over data and only unpivoted afterwards. -#}
+  SELECT
+    CURRENT_TIMESTAMP AS execution_ts,
+    '{{ rule_binding_id }}'::text AS rule_binding_id,
+    fused_rules.rule_id AS rule_id,
+    '{{ fully_qualified_table_name }}'::text AS table_id,
+    fused_rules.column_id AS column_id,
+    CASE fused_rules.rule_index
+{%- for rule_id in attribute_rules %}
+      WHEN {{ loop.index }} THEN fused_verdicts.column_value_{{ loop.index }}
+{%- endfor %}
+    END AS column_value,
+    {%- for ref_column_name in include_reference_columns %}
+    fused_verdicts.{{ ref_column_name }} AS {{ ref_column_name }},
+    {%- endfor %}
+    fused_rules.dimension AS dimension,
+    CASE fused_rules.rule_index
+{%- for rule_id in attribute_rules %}
+      WHEN {{ loop.index }} THEN fused_verdicts.simple_rule_row_is_valid_{{ loop.index }}
+{%- endfor %}
+    END AS simple_rule_row_is_valid,
+    CAST(NULL AS INT) AS complex_rule_validation_errors_count,
+    CAST(NULL AS BOOLEAN) AS complex_rule_validation_success_flag
+  FROM
+    (
+      SELECT
+{%- for rule_id, rule_configs in attribute_rules.items() %}
+{%- set column_name = rule_configs.get("params").get("rule_binding_arguments").get("p_column_name") %}
+        data.{{ column_name }} AS column_value_{{ loop.index }},
+        CASE
+{%- if rule_id == 'RL_NOT_NULL_CHECK' %}
+          WHEN {{ rule_configs.get("rule_sql_expr") }} THEN TRUE
+{%- else %}
+          WHEN {{ column_name }} IS NULL THEN CAST(NULL AS BOOLEAN)
+          WHEN {{ rule_configs.get("rule_sql_expr") }} THEN TRUE
+{%- endif %}
+        ELSE
+          FALSE
+        END AS simple_rule_row_is_valid_{{ loop.index }},
+{%- endfor %}
+{%- for ref_column_name in include_reference_columns %}
+        data.{{ ref_column_name }} AS {{ ref_column_name }},
+{%- endfor %}
+        zero_record.rule_binding_id AS rule_binding_id
+      FROM
+        zero_record
+      LEFT JOIN
+        data
+      ON
+        zero_record.rule_binding_id = data.rule_binding_id
+    ) fused_verdicts
+  CROSS JOIN
+    (
+{%- for rule_id, rule_configs in attribute_rules.items() %}
+{%- set column_name = rule_configs.get("params").get("rule_binding_arguments").get("p_column_name") %}
+      SELECT
+        {{ loop.index }} AS rule_index,
+        '{{ rule_id }}'::text AS rule_id,
+        '{{ column_name }}'::text AS column_id,
+{%- if rule_configs.get("dimension") %}
+        '{{ rule_configs.get("dimension") }}'::text AS dimension
+{%- else %}
+        CAST(NULL AS varchar) AS dimension
+{%- endif %}
+{%- if not loop.last %}
+      UNION ALL
+{%- endif %}
+{%- endfor %}
+    ) fused_rules
+{% endmacro -%}
+
 {% macro validate_complex_rule(rule_id, rule_configs, rule_binding_id, fully_qualified_table_name, include_reference_columns,rule_binding_params ) -%}
 {% set target_metric_column = rule_binding_params['tgt_tbl_metric_column'] -%}
 {% set target_key_columns = rule_binding_params['tgt_tbl_key_column'] -%}
@@ -155,3 +228,43 @@
   ON
     zero_record.rule_binding_id = custom_sql_statement_validation_errors.rule_binding_id
 {% endmacro -%}
+
+{% macro sample_data_clause(sampling, has_where_clause) -%}
+{#- Rows are picked by the hash of their key_columns, so the same rows are
+    sampled by every query and on every run. -#}
+{% set key_columns = sampling.get("key_columns") -%}
+{% set sample_hash -%}
+FNV_HASH(
+  {%- for key_column in key_columns -%}
+  COALESCE(CAST({{ key_column }} AS varchar), ''){% if not loop.last %} || '|' || {% endif %}
+  {%- endfor -%}
+)
+{%- endset -%}
+{% if sampling.get("fraction") -%}
+    {{ 'AND' if has_where_clause else 'WHERE' }}
+      ABS(MOD({{ sample_hash }}, 1000000)) < {{ (sampling.get("fraction") * 1000000)|round|int }}
+{%- else -%}
+    ORDER BY
+      {{ sample_hash }}
+    LIMIT {{ sampling.get("rows")|int }}
+{%- endif %}
+{% endmacro -%}
+
+{% macro sampled_percentage_columns(name, row_is_valid_condition) -%}
+{#- Share of validated rows with the given verdict and its 95% Wilson score
+    interval, with the sampled rows_validated as the sample size. -#}
+{% set p = "CAST(COUNT(CASE WHEN v.simple_rule_row_is_valid " ~ row_is_valid_condition ~ " THEN 1 ELSE NULL END) AS FLOAT) / v.rows_validated" -%}
+{% set n = "v.rows_validated" -%}
+{% set estimates = {
+    name ~ "_percentage": p,
+    name ~ "_percentage_ci_lower": "(" ~ p ~ " + 1.9208 / " ~ n ~ " - 1.96 * SQRT(" ~ p ~ " * (1 - " ~ p ~ ") / " ~ n ~ " + 0.9604 / (" ~ n ~ " * " ~ n ~ "))) / (1 + 3.8416 / " ~ n ~ ")",
+    name ~ "_percentage_ci_upper": "(" ~ p ~ " + 1.9208 / " ~ n ~ " + 1.96 * SQRT(" ~ p ~ " * (1 - " ~ p ~ ") / " ~ n ~ " + 0.9604 / (" ~ n ~ " * " ~ n ~ "))) / (1 + 3.8416 / " ~ n ~ ")",
+} -%}
+{%- for column_name, estimate in estimates.items() %}
+  CASE
+    WHEN v.rows_validated = 0 THEN NULL
+    WHEN MAX(v.complex_rule_validation_errors_count) IS NOT NULL THEN NULL
+    ELSE {{ estimate }}
+  END AS {{ column_name }},
+{%- endfor %}
+{%- endmacro -%}
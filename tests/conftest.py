@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Written to a temp dir by the configs_path fixture: the config loader also
+# reads every YAML file next to the configs path, which would otherwise pick
+# these up when the repo root is a configs path's parent.
+CONFIGS = {
+    "rule_dimensions.yml": {"rule_dimensions": ["accuracy", "completeness"]},
+    "entities/entities.yml": {
+        "entities": {
+            "TEST_MONTHLY_MEMBER_ELIGIBILITY_SNAPSHOT": {
+                "source_database": "REDSHIFT",
+                "schema_name": "data_science_edw",
+                "table_name": "monthly_member_eligibility_snapshot",
+                "columns": {
+                    "UPDATED_AT": {"name": "updated_at", "data_type": "TIMESTAMP"}
+                },
+            }
+        }
+    },
+    "reference_columns/reference_columns.yml": {
+        "reference_columns": {
+            "TEST_DATA_REFERENCE_COLUMNS": {
+                "include_reference_columns": ["group_id", "dupe_col1", "dupe_col2"]
+            }
+        }
+    },
+    "row_filters/row_filters.yml": {
+        "row_filters": {"NONE": {"filter_sql_expr": "AND True"}}
+    },
+    "rules/rules.yml": {
+        "rules": {
+            "RL_NOT_NULL_CHECK": {
+                "rule_type": "RT_ATTRIBUTE_LEVEL",
+                "dimension": "accuracy",
+                "params": {
+                    "custom_sql_arguments": ["p_column_name"],
+                    "custom_sql_expr": "$p_column_name IS NOT NULL",
+                },
+            },
+            "RL_VALUE_NOT_IN_TBL_CHECK": {
+                "rule_type": "RT_ATTRIBUTE_LEVEL",
+                "dimension": "completeness",
+                "params": {
+                    "custom_sql_arguments": [
+                        "p_column_name",
+                        "p_ref_column",
+                        "p_ref_table",
+                    ],
+                    "custom_sql_expr": (
+                        "$p_column_name NOT IN (select $p_ref_column from $p_ref_table)"
+                    ),
+                },
+            },
+        }
+    },
+    "rule_bindings/rule_bindings.yml": {
+        "rule_bindings": {
+            "bind_column_checks": {
+                "entity_id": "TEST_MONTHLY_MEMBER_ELIGIBILITY_SNAPSHOT",
+                "incremental_time_filter_column_id": "UPDATED_AT",
+                "row_filter_id": "NONE",
+                "reference_columns_id": "TEST_DATA_REFERENCE_COLUMNS",
+                "rule_ids": [
+                    {"RL_NOT_NULL_CHECK": {"p_column_name": "group_id"}},
+                    {
+                        "RL_VALUE_NOT_IN_TBL_CHECK": {
+                            "p_column_name": "member_id",
+                            "p_ref_column": "member_id",
+                            "p_ref_table": "DW.dim_member",
+                        }
+                    },
+                ],
+            }
+        }
+    },
+}
+
+
+@pytest.fixture(scope="session")
+def lib(tmp_path_factory):
+    # The logger writes DQlogs.log into the working directory.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(tmp_path_factory.mktemp("logs"))
+        monkeypatch.syspath_prepend(str(Path(__file__).parent.parent))
+        import lib
+
+        yield lib
+
+
+@pytest.fixture(scope="session")
+def configs_path(tmp_path_factory) -> Path:
+    configs_path = tmp_path_factory.mktemp("dq") / "configs"
+    for file_name, config in CONFIGS.items():
+        (configs_path / file_name).parent.mkdir(parents=True, exist_ok=True)
+        (configs_path / file_name).write_text(yaml.safe_dump(config))
+    return configs_path
@@ -0,0 +1,58 @@
+"""Columns --prune_data_columns projects for custom SQL rules."""
+from __future__ import annotations
+
+
+def rule_configs(sql_string: str, **rule_binding_arguments) -> dict:
+    return {
+        "params": {
+            "custom_sql_expr": sql_string,
+            "rule_binding_arguments": rule_binding_arguments,
+        }
+    }
+
+
+def test_column_arguments_are_projected(lib):
+    assert lib.get_rule_data_columns(
+        rule_configs("$p_column_name IS NOT NULL", p_column_name="group_id")
+    ) == {"group_id"}
+
+
+def test_reference_table_argument_is_not_a_column(lib):
+    assert lib.get_rule_data_columns(
+        rule_configs(
+            "$p_column_name NOT IN (SELECT m.member_id FROM $p_ref_table m)",
+            p_column_name="member_id",
+            p_ref_table="DW.dim_member",
+        )
+    ) == {"member_id"}
+
+
+def test_literal_arguments_are_not_columns(lib):
+    assert lib.get_rule_data_columns(
+        rule_configs(
+            "$p_column_name BETWEEN $lower_bound AND $upper_bound",
+            p_column_name="pri_itd_cnt",
+            lower_bound="10",
+            upper_bound="1000",
+        )
+    ) == {"pri_itd_cnt"}
+
+
+def test_unrecognized_column_argument_reads_all_columns(lib):
+    # RL_REFERENCE_TABLE_CHECK reads its data column through
+    # p_target_tbl_column, which could be any column of the entity.
+    assert (
+        lib.get_rule_data_columns(
+            rule_configs(
+                "$p_target_tbl_column NOT IN (SELECT member_id FROM DW.dim_member)",
+                p_target_tbl_column="member_id",
+            )
+        )
+        is None
+    )
+    assert (
+        lib.get_rule_data_columns(
+            rule_configs("$src_col > 0", src_col="metric_cnt")
+        )
+        is None
+    )
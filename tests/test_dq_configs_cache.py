@@ -0,0 +1,20 @@
+"""Bulk resolution of rule binding configs."""
+from __future__ import annotations
+
+
+def test_resolve_rule_bindings_does_not_depend_on_lru_size(
+    lib, configs_path, tmp_path
+):
+    configs_cache = lib.prepare_configs_cache(
+        configs_path, sqlite3_db_name=str(tmp_path / "dq_configs.db")
+    )
+    # Smaller than the entity, two rules, row filter and reference columns
+    # BIND_COLUMN_CHECKS references, so prefetched configs get evicted.
+    configs_cache._resolved_configs_maxsize = 1
+    resolved = configs_cache.resolve_rule_bindings(["bind_column_checks"])
+    assert configs_cache.resolved_configs_misses == 0
+    assert sorted(resolved["BIND_COLUMN_CHECKS"]["rule_configs_dict"]) == [
+        "RL_NOT_NULL_CHECK",
+        "RL_VALUE_NOT_IN_TBL_CHECK",
+    ]
+    assert configs_cache.get_resolved_configs_stats()["size"] == 1
@@ -0,0 +1,41 @@
+"""Columns a shared entity data scan projects with --prune_data_columns."""
+from __future__ import annotations
+
+
+def rule_binding_configs(lib, data_columns: list[str] | None) -> dict:
+    configs = {
+        "configs": {
+            "entity_configs": {"schema_name": "dw", "table_name": "member"},
+            "row_filter_configs": {"filter_sql_expr": "AND True"},
+        },
+        "share_entity_scan": True,
+        "data_columns": data_columns,
+    }
+    configs.update(lib.render_entity_data_scan_sql(configs))
+    return configs
+
+
+def scan_projection(configs: dict) -> str:
+    sql_string = configs["entity_data_scan_sql_string"]
+    return sql_string[sql_string.index("SELECT") + 6 : sql_string.index("FROM")].strip()
+
+
+def test_scan_projects_union_of_data_columns(lib):
+    shared = [
+        rule_binding_configs(lib, ["member_id", "group_id"]),
+        rule_binding_configs(lib, ["GROUP_ID", "updated_at"]),
+    ]
+    shared_entity_data_table = shared[0]["shared_entity_data_table"]
+    lib.project_entity_data_scans(shared)
+    for configs in shared:
+        assert configs["shared_entity_data_table"] == shared_entity_data_table
+        assert scan_projection(configs) == "member_id, group_id, updated_at"
+
+
+def test_scan_reads_all_columns_if_any_binding_does(lib):
+    shared = [
+        rule_binding_configs(lib, ["member_id"]),
+        rule_binding_configs(lib, None),
+    ]
+    lib.project_entity_data_scans(shared)
+    assert [scan_projection(configs) for configs in shared] == ["*", "*"]
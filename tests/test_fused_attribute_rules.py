@@ -0,0 +1,127 @@
+"""--fuse_attribute_rules must not change what a rule binding validates.
+
+BIND_COLUMN_CHECKS is rendered with and without fused attribute rules and
+both variants are run in SQLite. Their validation_results and failed
+records must be the same multisets of rows.
+"""
+from __future__ import annotations
+
+from collections import Counter
+import re
+import sqlite3
+
+import pytest
+
+RULE_BINDING_ID = "BIND_COLUMN_CHECKS"
+DATASETS = {
+    "mixed": [
+        ("2022-02-01", "g1", 1, "a", "b"),
+        ("2022-02-01", None, 3, "a", None),
+        ("2022-02-01", "g2", None, None, "b"),
+        ("2022-02-01", "g3", 2, "x", "y"),
+    ],
+    "empty": [],
+}
+
+
+class HighWatermarkClient:
+    """Answers the high watermark lookup of incremental rule bindings."""
+
+    def execute_query(self, query_string, parameters=None):
+        return [["2022-01-01 00:00:00", "2022-07-01 00:00:00"]]
+
+
+@pytest.fixture(scope="module")
+def rendered(lib, configs_path, tmp_path_factory):
+    all_rule_bindings = lib.load_rule_bindings_config(configs_path)
+    configs_cache = lib.prepare_configs_cache(
+        configs_path,
+        sqlite3_db_name=str(tmp_path_factory.mktemp("cache") / "dq_configs.db"),
+    )
+
+    def render(fuse_attribute_rules: bool) -> dict:
+        return lib.create_rule_binding_view_model(
+            rule_binding_id=RULE_BINDING_ID,
+            rule_binding_configs=all_rule_bindings[RULE_BINDING_ID],
+            dq_summary_table_name="dq_summary",
+            environment=None,
+            configs_cache=configs_cache,
+            redshift_client=HighWatermarkClient(),
+            fuse_attribute_rules=fuse_attribute_rules,
+        )
+
+    return {"per_rule": render(False), "fused": render(True)}
+
+
+def to_sqlite(sql_string: str) -> str:
+    """Rewrite the few Redshift-only bits of the generated SQL for SQLite."""
+    sql_string = re.sub(r"::text", "", sql_string)
+    sql_string = re.sub(r"(\w)FROM\n", r"\1 FROM\n", sql_string)
+    return sql_string.replace("WITHzero_record", "WITH zero_record").replace(
+        "WHERE\n      AND True", "WHERE True"
+    )
+
+
+def validation_results_sql(generated_sql_string: str) -> str:
+    ctes = generated_sql_string[
+        : generated_sql_string.index("all_validation_results AS (")
+    ]
+    return ctes.rstrip().rstrip(",") + "\nSELECT * FROM validation_results"
+
+
+def run_sql(sql_string: str, rows: list[tuple]) -> tuple[list[str], Counter]:
+    connection = sqlite3.connect(":memory:")
+    connection.execute("ATTACH ':memory:' AS data_science_edw")
+    connection.execute("ATTACH ':memory:' AS DW")
+    connection.execute(
+        "CREATE TABLE data_science_edw.monthly_member_eligibility_snapshot"
+        "(updated_at, group_id, member_id, dupe_col1, dupe_col2)"
+    )
+    connection.execute("CREATE TABLE DW.dim_member(member_id)")
+    connection.executemany("INSERT INTO DW.dim_member VALUES (?)", [(1,), (2,)])
+    connection.executemany(
+        "INSERT INTO data_science_edw.monthly_member_eligibility_snapshot "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    cursor = connection.execute(to_sqlite(sql_string))
+    column_names = [column[0] for column in cursor.description]
+    # execution_ts is the time each query ran at.
+    return column_names, Counter(
+        tuple(
+            value
+            for column_name, value in zip(column_names, row)
+            if column_name != "execution_ts"
+        )
+        for row in cursor.fetchall()
+    )
+
+
+def test_fused_sql_scans_data_once(rendered):
+    per_rule_sql = rendered["per_rule"]["generated_sql_string"]
+    fused_sql = rendered["fused"]["generated_sql_string"]
+    assert "fused_verdicts" not in per_rule_sql
+    assert "fused_verdicts" in fused_sql
+    assert fused_sql.count("LEFT JOIN\n        data") == 1
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_fused_validation_results_match_per_rule(rendered, dataset):
+    per_rule = run_sql(
+        validation_results_sql(rendered["per_rule"]["generated_sql_string"]),
+        DATASETS[dataset],
+    )
+    fused = run_sql(
+        validation_results_sql(rendered["fused"]["generated_sql_string"]),
+        DATASETS[dataset],
+    )
+    assert fused == per_rule
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_fused_failed_records_match_per_rule(rendered, dataset):
+    per_rule = run_sql(
+        rendered["per_rule"]["failed_records_sql_string"], DATASETS[dataset]
+    )
+    fused = run_sql(rendered["fused"]["failed_records_sql_string"], DATASETS[dataset])
+    assert fused == per_rule
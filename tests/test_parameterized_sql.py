@@ -0,0 +1,65 @@
+"""Run-time values bound as parameters with --parameterized_sql."""
+from __future__ import annotations
+
+import pytest
+
+INCREMENTAL_SQL = (
+    "SELECT * FROM data WHERE updated_at BETWEEN "
+    "CAST('${high_watermark_value}' AS TIMESTAMP) "
+    "AND CAST('${current_timestamp_value}' AS TIMESTAMP)"
+)
+SNAPSHOT_SQL = "SELECT * FROM data WHERE snapshot_end_dt = '$tgt_tbl_snapshot_value'"
+
+
+def bind(lib, compiled_sql: dict, **run_time_values) -> dict:
+    configs = {
+        "configs": {"rule_binding_id": "BIND_TEST"},
+        "parameterized_sql": True,
+        **run_time_values,
+    }
+    return lib.bind_rule_binding_sql(
+        configs,
+        {"failed_records_sql_string": "SELECT 1", **compiled_sql},
+        render_seconds=0.0,
+    )
+
+
+def test_only_referenced_values_are_bound(lib):
+    configs = bind(
+        lib,
+        {"generated_sql_string": INCREMENTAL_SQL},
+        high_watermark_value="2022-01-01 00:00:00",
+        current_timestamp_value="2022-07-01 00:00:00",
+    )
+    assert configs["sql_parameters"] == {
+        "high_watermark_value": "2022-01-01 00:00:00",
+        "current_timestamp_value": "2022-07-01 00:00:00",
+    }
+    assert ":high_watermark_value" in configs["generated_sql_string"]
+    assert ":current_timestamp_value" in configs["generated_sql_string"]
+
+
+def test_nothing_is_bound_without_placeholders(lib):
+    configs = bind(lib, {"generated_sql_string": "SELECT * FROM data"})
+    assert configs["sql_parameters"] == {}
+
+
+def test_referenced_value_must_be_set(lib):
+    with pytest.raises(ValueError, match="high_watermark_value"):
+        bind(
+            lib,
+            {"generated_sql_string": INCREMENTAL_SQL},
+            current_timestamp_value="2022-07-01 00:00:00",
+        )
+
+
+def test_snapshot_value_is_bound_only_if_referenced(lib):
+    configs = bind(lib, {"generated_sql_string": "SELECT * FROM data"})
+    lib.update_config_sql_string(configs, "snapshot_date", "2022-07-01")
+    assert "tgt_tbl_snapshot_value" not in configs["sql_parameters"]
+
+    configs = bind(lib, {"generated_sql_string": SNAPSHOT_SQL})
+    assert "'$tgt_tbl_snapshot_value'" in configs["generated_sql_string"]
+    lib.update_config_sql_string(configs, "snapshot_date", "2022-07-01")
+    assert ":tgt_tbl_snapshot_value" in configs["generated_sql_string"]
+    assert configs["sql_parameters"] == {"tgt_tbl_snapshot_value": "2022-07-01"}
@@ -18,12 +18,18 @@ import typing
 from jinja2 import ChainableUndefined  # type: ignore
 from jinja2 import DebugUndefined
 from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
 from jinja2 import FileSystemLoader
 from jinja2 import Template
 from jinja2 import select_autoescape
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 
 logger = getlogger()
 
@@ -31,11 +37,26 @@ logger = getlogger()
 MAXIMUM_EXPONENTIAL_BACKOFF_SECONDS = 32
 
 
-def load_yaml(file_path: Path, key: str = None) -> typing.Any:
+def load_yaml_file(file_path: Path) -> dict:
+    """Parse a YAML file once, using the libyaml C loader when available."""
     with file_path.open() as f:
-        yaml_configs = yaml.safe_load(f)
+        return load_yaml_string(f)
+
+
+def load_yaml_string(yaml_string: typing.Union[str, typing.IO]) -> dict:
+    yaml_configs = yaml.load(yaml_string, Loader=YamlSafeLoader)
     if not yaml_configs:
         return dict()
+    return yaml_configs
+
+
+def load_yaml(file_path: Path, key: str = None) -> typing.Any:
+    return get_yaml_config_node(file_path, load_yaml_file(file_path), key)
+
+
+def get_yaml_config_node(
+    file_path: Path, yaml_configs: dict, key: str
+) -> typing.Any:
     output = yaml_configs.get(key, dict())
     if type(output) == dict:
         return {key.upper(): value for key, value in output.items()}
@@ -187,14 +208,33 @@ def load_jinja_template(template_path: Path) -> Template:
                 f"Jinja template directory not found: "
                 f"{templates_parent_path.absolute()}"
             )
+        # Templates are compiled once per process; the bytecode cache also
+        # lets new processes skip compiling them from source.
         load_jinja_template.environment = environment = Environment(
             loader=FileSystemLoader(templates_parent_path),
             autoescape=select_autoescape(),
             undefined=DebugChainableUndefined,
+            bytecode_cache=FileSystemBytecodeCache(),
         )
         return environment.get_template(template_path.name)
 
 
+def get_templates_hashsum(templates_dir: Path = Path("macros")) -> str:
+    try:
+        return get_templates_hashsum.hashsums[templates_dir]
+    except AttributeError:
+        get_templates_hashsum.hashsums = {}
+    except KeyError:
+        pass
+    digest = hashlib.sha256()
+    for template_file in sorted(get_templates_path(templates_dir).glob("**/*")):
+        if template_file.is_file():
+            digest.update(template_file.name.encode("utf-8"))
+            digest.update(template_file.read_bytes())
+    get_templates_hashsum.hashsums[templates_dir] = digest.hexdigest()
+    return get_templates_hashsum.hashsums[templates_dir]
+
+
 def get_format_string_arguments(format_string: str) -> typing.List[str]:
     return [t[1] for t in string.Formatter().parse(format_string) if t[1] is not None]
 